@@ -2,7 +2,6 @@ import inspect
 import multiprocessing
 import os
 import sys
-from functools import partial
 
 currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 parentdir = os.path.dirname(currentdir)
@@ -14,23 +13,20 @@ import numpy as np
 
 import neat
 from neat.evaluators import ParallelEvaluator
+from neat.fitness import least_squares
 
+# The training data is constant, so it is built once at import time and
+# inherited by the worker processes instead of being rebuilt per evaluation.
+INPUTS = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]], dtype=np.float32)
+TARGETS = np.array([[0.0], [1.0], [1.0], [0.0]], dtype=np.float32)
 
-def least_squares(output: np.ndarray, correct_ouput: np.ndarray) -> float:
-    return np.sum(np.square(output - correct_ouput))
 
-
-def fitness_func(data, genome: neat.Genome, _) -> float:
+def fitness_func(genome: neat.Genome, _) -> float:
+    # Every worker receives a freshly unpickled genome, so there is no cached
+    # network to reuse.
     network = neat.FeedForwardNetwork.from_genome(genome)
-    loss: float = 0.0
-
-    for input, correct_output in data:
-        input = np.array(input, dtype=np.float32)
-        correct_output = np.array(correct_output, dtype=np.float32)
-
-        output = np.asarray(network.activate(input))
-        loss += least_squares(output, correct_output)
-
+    outputs = network.activate_batch(INPUTS)
+    loss = float(least_squares(outputs.ravel(), TARGETS.ravel()))
     return max(4.0 - loss, 0.0)
 
 
@@ -40,22 +36,14 @@ def main():
     params = neat.Parameters(config_file)
     population = neat.Population(params)
 
-    inputs = [
-        ([0.0, 0.0], [0.0]),
-        ([0.0, 1.0], [1.0]),
-        ([1.0, 0.0], [1.0]),
-        ([1.0, 1.0], [0.0]),
-    ]
-
-    eval_func = partial(fitness_func, inputs)
-    evaluator = ParallelEvaluator(multiprocessing.cpu_count(), eval_func)
+    with ParallelEvaluator(multiprocessing.cpu_count(), fitness_func) as evaluator:
+        genome, _ = population.run(evaluator.evaluate, 50)
 
-    genome, _ = population.run(evaluator.evaluate, 50)
     print(f"The best genome is {genome.id} with fitness {genome.fitness:.3f}.")
     winner_net = neat.FeedForwardNetwork.from_genome(genome)
 
-    for input, correct_output in inputs:
-        output = winner_net.activate(np.asarray(input))
+    for input, correct_output in zip(INPUTS, TARGETS):
+        output = winner_net.activate(input)
         print(f"{input} -> {output} instead of {correct_output}")
 
 
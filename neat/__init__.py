@@ -2,3 +2,4 @@ from neat.genomes import Genome
 from neat.networks import FeedForwardNetwork
 from neat.parameters import Parameters
 from neat.population import Population
+from neat.seeding import seed
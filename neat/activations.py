@@ -2,7 +2,8 @@ import math
 from enum import StrEnum
 from typing import Callable
 
-from numba import njit
+import numpy as np
+from numba import vectorize
 
 
 class ActivationFuncs(StrEnum):
@@ -12,32 +13,41 @@ class ActivationFuncs(StrEnum):
     LINEAR = "linear"
 
 
-def get_activation_func(func: ActivationFuncs) -> Callable[[float], float]:
-    activation_func_mapper = {
-        ActivationFuncs.SIGMOID: sigmoid,
-        ActivationFuncs.RELU: relu,
-        ActivationFuncs.TANH: tanh,
-    }
-    return activation_func_mapper[func]
+def get_activation_func(func: ActivationFuncs) -> Callable[[np.ndarray], np.ndarray]:
+    return _ACTIVATION_FUNCS[func]
 
 
-@njit
+# The activations are compiled as ufuncs, so that they can be applied to whole
+# layers of a network at once, as well as to single values.
+_SIGNATURES = ["float32(float32)", "float64(float64)"]
+
+
+@vectorize(_SIGNATURES, cache=True)
 def relu(value: float) -> float:
     return max(value, 0.0)
 
 
-@njit
+@vectorize(_SIGNATURES, cache=True)
 def sigmoid(value: float) -> float:
     value = max(-60.0, min(60.0, 5.0 * value))
     return 1.0 / (1.0 + math.exp(-value))
 
 
-@njit
+@vectorize(_SIGNATURES, cache=True)
 def tanh(value: float) -> float:
     value = max(-60.0, min(60.0, 2.5 * value))
     return math.tanh(value)
 
 
-@njit
+@vectorize(_SIGNATURES, cache=True)
 def linear(value: float) -> float:
     return value
+
+
+# The lookup table is built once, at import.
+_ACTIVATION_FUNCS: dict[ActivationFuncs, Callable[[np.ndarray], np.ndarray]] = {
+    ActivationFuncs.SIGMOID: sigmoid,
+    ActivationFuncs.RELU: relu,
+    ActivationFuncs.TANH: tanh,
+    ActivationFuncs.LINEAR: linear,
+}
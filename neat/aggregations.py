@@ -1,10 +1,7 @@
 from enum import StrEnum
-from operator import mul
 from typing import Callable
 
 import numpy as np
-from numba import njit
-from numba.core.typeinfer import reduce
 
 
 class AggregationFuncs(StrEnum):
@@ -17,24 +14,26 @@ class AggregationFuncs(StrEnum):
     MEDIAN = "median"
 
 
-def get_aggregation_func(func: AggregationFuncs) -> Callable[[list[float]], float]:
-    aggregation_func_mapper = {
-        AggregationFuncs.MAX: np.max,
-        AggregationFuncs.MIN: np.min,
-        AggregationFuncs.MAXABS: maxabs,
-        AggregationFuncs.MEAN: np.mean,
-        AggregationFuncs.SUM: np.sum,
-        AggregationFuncs.PRODUCT: product,
-        AggregationFuncs.MEDIAN: np.median,
-    }
-    return aggregation_func_mapper[func]
+def get_aggregation_func(func: AggregationFuncs) -> Callable[..., np.ndarray]:
+    """Returns the aggregation function. Every aggregation accepts an `axis`
+    argument, so it can reduce the inputs of many evaluations at once."""
+    return _AGGREGATION_FUNCS[func]
 
 
-@njit
-def product(values: list[int]):
-    return reduce(mul, values, 1.0)
+def maxabs(values: np.ndarray, axis: int = -1) -> np.ndarray:
+    """Returns the values with the largest magnitude along the given axis."""
+    values = np.asarray(values)
+    indices = np.expand_dims(np.argmax(np.abs(values), axis=axis), axis)
+    return np.take_along_axis(values, indices, axis).squeeze(axis)
 
 
-@njit
-def maxabs(values: list[int]):
-    return max(values, key=abs)
+# Built once at import, instead of on every lookup.
+_AGGREGATION_FUNCS: dict[AggregationFuncs, Callable[..., np.ndarray]] = {
+    AggregationFuncs.MAX: np.max,
+    AggregationFuncs.MIN: np.min,
+    AggregationFuncs.MAXABS: maxabs,
+    AggregationFuncs.MEAN: np.mean,
+    AggregationFuncs.SUM: np.sum,
+    AggregationFuncs.PRODUCT: np.prod,
+    AggregationFuncs.MEDIAN: np.median,
+}
@@ -0,0 +1,40 @@
+import re
+from pathlib import Path
+from typing import Callable
+
+_SECTION = re.compile(r"^\s*\[([^\]]+)\]\s*$")
+_KEY_VALUE = re.compile(r"^\s*([^#;=:\s][^=:]*?)\s*[=:]\s*(.*?)\s*$")
+
+
+def parse_config(
+    config_file: Path, normalize: Callable[[str], str] = str.lower
+) -> dict[str, dict[str, str]]:
+    """Reads an INI file into a dict of sections, each a dict of its options.
+    Section and option names are passed through `normalize`.
+
+    Only the subset of INI that the NEAT configs use is supported, i.e. no
+    interpolation, multiline values or default section.
+    """
+    sections: dict[str, dict[str, str]] = {}
+    section = None
+
+    with open(config_file) as file:
+        for line_number, line in enumerate(file, start=1):
+            stripped = line.strip()
+            if not stripped or stripped[0] in "#;":
+                continue
+
+            if match := _SECTION.match(line):
+                section = sections.setdefault(normalize(match[1].strip()), {})
+                continue
+
+            match = _KEY_VALUE.match(line)
+            if match is None:
+                raise ValueError(f"Invalid line {line_number} in config: {line!r}.")
+
+            if section is None:
+                raise ValueError(f"Option on line {line_number} is outside a section.")
+
+            section[normalize(match[1])] = match[2]
+
+    return sections
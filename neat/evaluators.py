@@ -1,31 +1,123 @@
-from multiprocessing import Pool
-from multiprocessing.pool import AsyncResult
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
 from typing import Callable, Optional
 
 from .genomes import Genome
 
+# The evaluation function of the pool, set once per worker process by
+# `_init_worker` so that it doesn't travel with every task.
+_EVAL_FUNCTION: Optional[Callable[[Genome, list[Genome]], float]] = None
+# The opponents of the current generation, deserialized at most once per worker.
+_OPPONENTS: tuple[str, list[Genome]] = ("", [])
+
+
+def _get_context() -> BaseContext:
+    # Forked workers inherit the imported modules of the parent, instead of
+    # importing everything again as with spawn.
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+
+    return multiprocessing.get_context()
+
+
+def _init_worker(eval_function: Callable[[Genome, list[Genome]], float]):
+    global _EVAL_FUNCTION
+    _EVAL_FUNCTION = eval_function
+
+
+def _load_opponents(shm_name: str) -> list[Genome]:
+    global _OPPONENTS
+    name, opponents = _OPPONENTS
+    if name == shm_name:
+        return opponents
+
+    shm = SharedMemory(name=shm_name)
+    try:
+        # Bytes past the end of the pickle (page padding) are ignored.
+        opponents = pickle.loads(shm.buf)
+    finally:
+        shm.close()
+
+    _OPPONENTS = (shm_name, opponents)
+    return opponents
+
+
+def _evaluate(shm_name: str, genome: Genome) -> float:
+    assert _EVAL_FUNCTION is not None
+    return _EVAL_FUNCTION(genome, _load_opponents(shm_name))
+
 
 class ParallelEvaluator:
+    """Evaluates genomes on a pool of worker processes. The pool is started once
+    and reused for every generation, so a single evaluator should be created
+    per training run and closed at the end, preferably with a `with` block."""
+
     def __init__(
         self,
         num_workers: int,
         eval_function: Callable[[Genome, list[Genome]], float],
         timeout: Optional[float] = None,
     ):
+        # Set first, so that `close` is a no-op if the pool fails to start.
+        self._closed = True
         self.num_workers = num_workers
         self.eval_function = eval_function
         self.timeout = timeout
-        self.pool = Pool(num_workers)
+        self.executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=_get_context(),
+            initializer=_init_worker,
+            initargs=(eval_function,),
+        )
+        self._closed = False
+
+    def __enter__(self) -> ParallelEvaluator:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
 
     def __del__(self):
-        self.pool.close()
-        self.pool.join()
+        self.close()
+
+    def close(self):
+        """Stops the worker processes, after they finish their pending tasks."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self.executor.shutdown(wait=True)
 
     def evaluate(self, genomes: list[Genome], opponents: list[Genome]):
-        jobs: list[AsyncResult] = []
-        for genome in genomes:
-            jobs.append(self.pool.apply_async(self.eval_function, (genome, opponents)))
+        # The opponents are serialized once into shared memory and the workers
+        # only receive the name of the block, instead of a copy per chunk. The
+        # block is owned by the evaluator, which unlinks it once the workers
+        # are done with it.
+        data = pickle.dumps(opponents, protocol=pickle.HIGHEST_PROTOCOL)
+        shm = SharedMemory(create=True, size=max(1, len(data)))
+        shm.buf[: len(data)] = data
+
+        try:
+            # Hand the genomes to the workers in chunks so that the per task
+            # overhead of the pool is amortized over several evaluations.
+            chunksize = max(1, len(genomes) // (4 * self.num_workers))
+            eval_function = partial(_evaluate, shm.name)
+            fitnesses = list(
+                self.executor.map(
+                    eval_function, genomes, timeout=self.timeout, chunksize=chunksize
+                )
+            )
+        finally:
+            shm.close()
+            shm.unlink()
 
         # assign the fitness back to each genome
-        for job, genome in zip(jobs, genomes):
-            genome.fitness = job.get(timeout=self.timeout)
+        for genome, fitness in zip(genomes, fitnesses):
+            genome.fitness = fitness
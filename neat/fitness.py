@@ -14,13 +14,23 @@ class LossFuncs(StrEnum):
 
 
 def get_loss_func(func: LossFuncs) -> Callable[[np.ndarray, np.ndarray], float]:
-    loss_func_mapper = {
-        LossFuncs.LEAST_SQUARES: least_squares,
-    }
+    return _LOSS_FUNCS[func]
 
-    return loss_func_mapper[func]
 
-
-@njit
+@njit(
+    ["float32(float32[:], float32[:])", "float64(float64[:], float64[:])"],
+    cache=True,
+    fastmath=True,
+)
 def least_squares(output: np.ndarray, correct_ouput: np.ndarray) -> float:
-    return np.sum(np.square(output - correct_ouput))
+    loss = 0.0
+    for i in range(output.shape[0]):
+        diff = output[i] - correct_ouput[i]
+        loss += diff * diff
+
+    return loss
+
+
+_LOSS_FUNCS: dict[LossFuncs, Callable[[np.ndarray, np.ndarray], float]] = {
+    LossFuncs.LEAST_SQUARES: least_squares,
+}
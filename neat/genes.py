@@ -6,15 +6,22 @@ import random
 from dataclasses import dataclass
 from enum import Enum, StrEnum, auto
 from inspect import get_annotations
-from typing import Any, Callable, ClassVar, Self, Type
+from typing import Any, Callable, ClassVar, Optional, Self, Type
 
+import numpy as np
 from numba import njit
 
-from neat.activations import ActivationFuncs, get_activation_func
-from neat.aggregations import AggregationFuncs, get_aggregation_func
+from neat.activations import ActivationFuncs
+from neat.aggregations import AggregationFuncs
 from neat.parameters import GenomeParams
 from neat.types import LinkID, NodeID, SLink
-from neat.utils import clamp
+
+# Random generator used for the batched mutation of gene attributes. It is
+# seeded, together with `random`, by `neat.seeding.seed`.
+RNG = np.random.default_rng()
+
+# How many initial values of an attribute are drawn at once.
+_INITIAL_VALUES_BLOCK = 1024
 
 
 class NodeType(StrEnum):
@@ -23,11 +30,39 @@ class NodeType(StrEnum):
     OUTPUT = auto()
 
 
+Mutator = Callable[[list["Gene"]], None]
+
+
 def gene(cls: Type) -> Type:
     cls._annotations = get_annotations(cls, eval_str=True)
+    # Resolve the kind of every mutable attribute once, at class creation.
+    cls._mutable_attrs = [
+        (attr, get_attr_kind(attr_type))
+        for attr, attr_type in cls._annotations.items()
+        if attr not in cls._excluded_attrs_from_mutation
+    ]
+    default_getters = {
+        bool: cls.get_default_bool_attr,
+        Enum: cls.get_default_enum_attr,
+        float: cls.get_default_float_attr,
+        int: cls.get_default_int_attr,
+    }
+    cls._default_getters = [
+        (attr, default_getters[attr_kind]) for attr, attr_kind in cls._mutable_attrs
+    ]
     return dataclass(repr=False)(cls)
 
 
+def get_attr_kind(attr_type: Type) -> Type:
+    """Returns which of bool, Enum, float and int the attribute type is. bool is
+    checked before int, because it is a subclass of it."""
+    for attr_kind in (bool, Enum, float, int):
+        if issubclass(attr_type, attr_kind):
+            return attr_kind
+
+    raise NotImplementedError("Mutation attr type is not implemented.")
+
+
 class Gene:
     _excluded_attrs_from_mutation: ClassVar[set[str]] = {
         "id",
@@ -36,6 +71,14 @@ class Gene:
         "out_node",
     }
     _annotations = {}
+    _mutable_attrs: ClassVar[list[tuple[str, Type]]] = []
+    _default_getters: ClassVar[list[tuple[str, Callable[[str, GenomeParams], Any]]]]
+    _mutators: ClassVar[list[Mutator]] = []
+    # The parameters, and their version, that the cached mutators and initial
+    # values were built from.
+    _mutators_key: ClassVar[Optional[tuple[GenomeParams, int]]] = None
+    _initial_values: ClassVar[dict[str, list[float]]] = {}
+    _initial_values_key: ClassVar[Optional[tuple[GenomeParams, int]]] = None
 
     def __init__(self, id: int):
         self.id = id
@@ -79,9 +122,11 @@ class Gene:
         inherits values from both parents with equal probability."""
         assert self.id == other.id
 
+        # Bound once, as this runs for every attribute of every inherited gene.
+        rand = random.random
         attrs = {}
         for attr in self._annotations.keys():
-            if random.random() < 0.5:
+            if rand() < 0.5:
                 attrs[attr] = getattr(self, attr)
             else:
                 attrs[attr] = getattr(other, attr)
@@ -89,127 +134,176 @@ class Gene:
         return self.__class__(**attrs)
 
     def mutate(self, params: GenomeParams):
-        for attr, attr_type in self._annotations.items():
-            if attr in self._excluded_attrs_from_mutation:
-                continue
+        self.mutate_batch([self], params)
 
-            if issubclass(attr_type, bool):
-                self.mutate_bool(attr, params)
-            elif issubclass(attr_type, Enum):
-                self.mutate_enum(attr, params)
-            elif issubclass(attr_type, float):
-                self.mutate_float(attr, params)
-            elif issubclass(attr_type, int):
-                self.mutate_int(attr, params)
-            else:
-                raise NotImplementedError("Mutation attr type is not implemented.")
+    @classmethod
+    def mutate_batch(cls, genes: list[Self], params: GenomeParams):
+        """Mutates the attributes of all the given genes. The random values
+        of each attribute are drawn for the whole batch at once."""
+        if not genes:
+            return
 
-    def mutate_float(self, attr: str, params: GenomeParams):
-        mutation_chance: float = getattr(params, f"{attr}_mutation_chance")
-        replace_chance: float = getattr(params, f"{attr}_replace_chance")
+        for mutator in cls.get_mutators(params):
+            mutator(genes)
 
-        if random.random() < mutation_chance:
-            min_value: int = getattr(params, f"{attr}_min_value")
-            max_value: int = getattr(params, f"{attr}_max_value")
+    @classmethod
+    def get_mutators(cls, params: GenomeParams) -> list[Mutator]:
+        """Returns the mutation functions of the gene's attributes. They are
+        built once per class and version of the parameters, with the values
+        bound, so that mutating genes doesn't need any attribute lookups."""
+        key = (params, params.version)
+        if cls._mutators_key != key:
+            cls._mutators = cls.build_mutators(params)
+            cls._mutators_key = key
 
-            if random.random() < replace_chance:
-                init_mean: float = getattr(params, f"{attr}_init_mean")
-                init_stdev: float = getattr(params, f"{attr}_init_stdev")
-                value = random.gauss(init_mean, init_stdev)
-            else:
-                mutation_power: float = getattr(params, f"{attr}_mutation_power")
-                curr_value: int = getattr(self, attr)
-                change = random.gauss(0.0, mutation_power)
-                value = curr_value + change
+        return cls._mutators
 
-            setattr(self, attr, clamp(value, min_value, max_value))
+    @classmethod
+    def build_mutators(cls, params: GenomeParams) -> list[Mutator]:
+        mutator_factories = {
+            bool: cls.get_bool_mutator,
+            Enum: cls.get_enum_mutator,
+            float: cls.get_float_mutator,
+            int: cls.get_int_mutator,
+        }
+        return [
+            mutator_factories[attr_kind](attr, params)
+            for attr, attr_kind in cls._mutable_attrs
+        ]
 
-    def mutate_int(self, attr: str, params: GenomeParams):
-        mutation_chance: float = getattr(params, f"{attr}_mutation_chance")
-        replace_chance: float = getattr(params, f"{attr}_replace_chance")
+    @staticmethod
+    def get_float_mutator(attr: str, params: GenomeParams) -> Mutator:
+        p = params.attribute_params(attr)
+        mutation_chance, replace_chance = p.mutation_chance, p.replace_chance
+        min_value, max_value = p.min_value, p.max_value
+        init_mean, init_stdev = p.init_mean, p.init_stdev
+        mutation_power = p.mutation_power
+
+        def mutate(genes: list[Gene]):
+            mutated = np.flatnonzero(RNG.random(len(genes)) < mutation_chance)
+            if not mutated.size:
+                return
+
+            size = mutated.size
+            values = np.fromiter(
+                (getattr(genes[i], attr) for i in mutated), np.float64, count=size
+            )
+            replaced = RNG.random(size) < replace_chance
+            values = np.where(
+                replaced,
+                RNG.normal(init_mean, init_stdev, size),
+                values + RNG.normal(0.0, mutation_power, size),
+            )
+            np.clip(values, min_value, max_value, out=values)
+
+            for i, value in zip(mutated, values.tolist()):
+                setattr(genes[i], attr, value)
+
+        return mutate
 
-        if random.random() < mutation_chance:
-            min_value: int = getattr(params, f"{attr}_min_value")
-            max_value: int = getattr(params, f"{attr}_max_value")
+    @staticmethod
+    def get_int_mutator(attr: str, params: GenomeParams) -> Mutator:
+        p = params.attribute_params(attr)
+        mutation_chance, replace_chance = p.mutation_chance, p.replace_chance
+        min_value, max_value = p.min_value, p.max_value
+        init_mean, init_stdev = p.init_mean, p.init_stdev
+        mutation_power = p.mutation_power
+
+        def mutate(genes: list[Gene]):
+            mutated = np.flatnonzero(RNG.random(len(genes)) < mutation_chance)
+            if not mutated.size:
+                return
+
+            size = mutated.size
+            values = np.fromiter(
+                (getattr(genes[i], attr) for i in mutated), np.float64, count=size
+            )
+            replaced = RNG.random(size) < replace_chance
+            values = np.where(
+                replaced,
+                RNG.normal(init_mean, init_stdev, size),
+                values + RNG.normal(0.0, mutation_power, size),
+            )
+            values = np.ceil(np.clip(values, min_value, max_value))
+
+            for i, value in zip(mutated, values.astype(np.int64).tolist()):
+                setattr(genes[i], attr, value)
+
+        return mutate
 
-            if random.random() < replace_chance:
-                init_mean: float = getattr(params, f"{attr}_init_mean")
-                init_stdev: float = getattr(params, f"{attr}_init_stdev")
-                value = random.gauss(init_mean, init_stdev)
-            else:
-                mutation_power: float = getattr(params, f"{attr}_mutation_power")
-                curr_value: int = getattr(self, attr)
-                change = random.gauss(0.0, mutation_power)
-                value = curr_value + change
+    @staticmethod
+    def get_bool_mutator(attr: str, params: GenomeParams) -> Mutator:
+        mutation_chance = params.attribute_params(attr).mutation_chance
 
-            setattr(self, attr, math.ceil(clamp(value, min_value, max_value)))
+        def mutate(genes: list[Gene]):
+            mutated = np.flatnonzero(RNG.random(len(genes)) < mutation_chance)
+            for i in mutated:
+                gene = genes[i]
+                setattr(gene, attr, not getattr(gene, attr))
 
-    def mutate_bool(self, attr: str, params: GenomeParams):
-        mutation_chance: float = getattr(params, f"{attr}_mutation_chance")
+        return mutate
 
-        if random.random() < mutation_chance:
-            curr_value: bool = getattr(self, attr)
-            setattr(self, attr, not curr_value)
+    @staticmethod
+    def get_enum_mutator(attr: str, params: GenomeParams) -> Mutator:
+        p = params.attribute_params(attr)
+        mutation_chance = p.mutation_chance
+        options: list[StrEnum] = p.options
 
-    def mutate_enum(self, attr: str, params: GenomeParams):
-        mutation_chance: float = getattr(params, f"{attr}_mutation_chance")
+        def mutate(genes: list[Gene]):
+            mutated = np.flatnonzero(RNG.random(len(genes)) < mutation_chance)
+            choices = RNG.integers(len(options), size=mutated.size)
+            for i, choice in zip(mutated, choices):
+                setattr(genes[i], attr, options[choice])
 
-        if random.random() < mutation_chance:
-            options: list[StrEnum] = getattr(params, f"{attr}_options")
-            value = random.choice(options)
-            setattr(self, attr, value)
+        return mutate
 
     def copy(self) -> Gene:
         return copy.copy(self)
 
     @classmethod
     def get_default_args(cls, params: GenomeParams) -> list[Any]:
-        values = []
-        for attr, attr_type in cls._annotations.items():
-            if attr in cls._excluded_attrs_from_mutation:
-                continue
-
-            if issubclass(attr_type, bool):
-                value = cls.get_default_bool_attr(attr, params)
-            elif issubclass(attr_type, Enum):
-                value = cls.get_default_enum_attr(attr, params)
-            elif issubclass(attr_type, float):
-                value = cls.get_default_float_attr(attr, params)
-            elif issubclass(attr_type, int):
-                value = cls.get_default_int_attr(attr, params)
-            else:
-                raise NotImplementedError("Mutation attr type is not implemented.")
-
-            values.append(value)
-        return values
+        return [getter(attr, params) for attr, getter in cls._default_getters]
 
-    @staticmethod
-    def get_default_float_attr(attr: str, params: GenomeParams) -> float:
-        init_mean: float = getattr(params, f"{attr}_init_mean")
-        init_stdev: float = getattr(params, f"{attr}_init_stdev")
-        min_value: int = getattr(params, f"{attr}_min_value")
-        max_value: int = getattr(params, f"{attr}_max_value")
+    @classmethod
+    def clear_initial_values(cls):
+        """Drops the pooled initial values, so that the next ones are drawn
+        from the current state of `RNG`."""
+        cls._initial_values = {}
+        cls._initial_values_key = None
 
-        value = random.gauss(init_mean, init_stdev)
-        return clamp(value, min_value, max_value)
+    @classmethod
+    def get_initial_value(cls, attr: str, params: GenomeParams) -> float:
+        """Returns a random initial value of the attribute, clamped to its range.
+        The values are drawn in blocks, instead of one at a time per gene."""
+        key = (params, params.version)
+        if cls._initial_values_key != key:
+            cls._initial_values = {}
+            cls._initial_values_key = key
+
+        values = cls._initial_values.get(attr)
+        if not values:
+            p = params.attribute_params(attr)
+            block = RNG.normal(p.init_mean, p.init_stdev, _INITIAL_VALUES_BLOCK)
+            values = np.clip(block, p.min_value, p.max_value).tolist()
+            cls._initial_values[attr] = values
+
+        return values.pop()
 
-    @staticmethod
-    def get_default_int_attr(attr: str, params: GenomeParams) -> int:
-        init_mean: float = getattr(params, f"{attr}_init_mean")
-        init_stdev: float = getattr(params, f"{attr}_init_stdev")
-        min_value: int = getattr(params, f"{attr}_min_value")
-        max_value: int = getattr(params, f"{attr}_max_value")
+    @classmethod
+    def get_default_float_attr(cls, attr: str, params: GenomeParams) -> float:
+        return cls.get_initial_value(attr, params)
 
-        value = random.gauss(init_mean, init_stdev)
-        return math.ceil(clamp(value, min_value, max_value))
+    @classmethod
+    def get_default_int_attr(cls, attr: str, params: GenomeParams) -> int:
+        return math.ceil(cls.get_initial_value(attr, params))
 
     @staticmethod
     def get_default_bool_attr(attr: str, params: GenomeParams) -> bool:
-        return getattr(params, f"{attr}_default")
+        return params.attribute_params(attr).default
 
     @staticmethod
     def get_default_enum_attr(attr: str, params: GenomeParams) -> Enum:
-        return getattr(params, f"{attr}_default")
+        return params.attribute_params(attr).default
 
 
 @gene
@@ -235,26 +329,15 @@ class Node(Gene):
 
         return distance
 
-    def get_evaluator(self) -> Callable[[list[float]], float]:
-        aggregator = get_aggregation_func(self.aggregator)
-        activator = get_activation_func(self.activator)
-
-        if self.node_type in (NodeType.INPUT, NodeType.OUTPUT):
-
-            def evaluate(input: list[float]) -> float:
-                return aggregator(input)
-
-        elif self.node_type == NodeType.HIDDEN:
-
-            def evaluate(input: list[float]) -> float:
-                aggregated_input = aggregator(input)
-                return activator(aggregated_input * self.response + self.bias)
-
-        else:
-            msg = f"Activation of {self.node_type} is not currently implemented."
-            raise NotImplementedError(msg)
-
-        return evaluate
+    def copy(self) -> Node:
+        return Node(
+            self.id,
+            self.node_type,
+            self.bias,
+            self.response,
+            self.aggregator,
+            self.activator,
+        )
 
 
 @gene
@@ -268,6 +351,10 @@ class Link(Gene):
 
     _attrs_excluded_from_mutation = ["id", "in_node", "out_node"]
 
+    def __post_init__(self):
+        # The ends of a link never change, so the tuple is built only once.
+        self.simple_link: SLink = (self.in_node, self.out_node)
+
     def distance(self, other: Link) -> float:
         distance = abs(self.weight - other.weight)
 
@@ -279,9 +366,15 @@ class Link(Gene):
 
         return distance
 
-    @property
-    def simple_link(self) -> SLink:
-        return (self.in_node, self.out_node)
+    def copy(self) -> Link:
+        return Link(
+            self.id,
+            self.in_node,
+            self.out_node,
+            self.weight,
+            self.enabled,
+            self.frozen,
+        )
 
     def enable(self):
         self.enabled = True
@@ -1,16 +1,86 @@
 from __future__ import annotations
 
 import random
-from typing import Optional
+from dataclasses import dataclass
+from enum import Enum
+from itertools import chain
+from typing import Any, Iterable, Mapping, Optional
 
-from neat.genes import Link, Node, NodeType
+import numpy as np
+
+from neat.activations import ActivationFuncs
+from neat.aggregations import AggregationFuncs
+from neat.genes import RNG, Link, Node, NodeType
 from neat.innovation import InnovationRecord
 from neat.parameters import GenomeParams
 from neat.types import LinkID, NodeID, SLink
-from neat.utils import get_random_value
+
+# The enums of the genes as integers, so that they can be stored in arrays.
+_CATEGORY_CODES: dict[Enum, int] = {
+    member: code for code, member in enumerate(chain(ActivationFuncs, AggregationFuncs))
+}
+
+
+@dataclass
+class GeneArrays:
+    """The genes of a genome as arrays sorted by id, from which the distance
+    between genomes is computed. Values are compared by their absolute
+    difference and categories, i.e. enums and bools, by whether they differ."""
+
+    # The bias and response of the nodes and their activator and aggregator.
+    node_ids: np.ndarray
+    node_values: np.ndarray
+    node_categories: np.ndarray
+    # The weight of the links and whether they are enabled and frozen.
+    link_ids: np.ndarray
+    link_values: np.ndarray
+    link_categories: np.ndarray
+
+    @staticmethod
+    def from_genes(nodes: dict[NodeID, Node], links: dict[LinkID, Link]) -> GeneArrays:
+        sorted_nodes = [nodes[i] for i in sorted(nodes)]
+        sorted_links = [links[i] for i in sorted(links)]
+        return GeneArrays(
+            node_ids=np.array([n.id for n in sorted_nodes], dtype=np.int64),
+            node_values=np.array(
+                [(n.bias, n.response) for n in sorted_nodes], dtype=np.float64
+            ).reshape(-1, 2),
+            node_categories=np.array(
+                [
+                    (_CATEGORY_CODES[n.activator], _CATEGORY_CODES[n.aggregator])
+                    for n in sorted_nodes
+                ],
+                dtype=np.int64,
+            ).reshape(-1, 2),
+            link_ids=np.array([l.id for l in sorted_links], dtype=np.int64),
+            link_values=np.array(
+                [(l.weight,) for l in sorted_links], dtype=np.float64
+            ).reshape(-1, 1),
+            link_categories=np.array(
+                [(l.enabled, l.frozen) for l in sorted_links], dtype=np.int64
+            ).reshape(-1, 2),
+        )
 
 
 class Genome:
+    __slots__ = (
+        "parents",
+        "id",
+        "fitness",
+        "innov_record",
+        "nodes",
+        "links",
+        "networks",
+        "_outgoing",
+        "_incoming",
+        "_simple_links",
+        "_link_ids",
+        "_link_positions",
+        "_nodes_by_type",
+        "_link_endpoints",
+        "_gene_arrays",
+    )
+
     params: GenomeParams
 
     @classmethod
@@ -39,6 +109,35 @@ class Genome:
 
         self.nodes: dict[NodeID, Node] = nodes
         self.links: dict[LinkID, Link] = links
+        # The phenotypes built from the genome, by network type, and the genes
+        # as arrays for the distance between genomes. Both are built when first
+        # needed and dropped by `clear_caches` whenever the genome changes.
+        self.networks: dict[type, Any] = {}
+        self._gene_arrays: Optional[GeneArrays] = None
+        # The links that leave and enter each node, keyed by the node at their
+        # other end, and the id of the link between every pair of nodes, kept
+        # in sync with the links by `add_link` and `remove_link`.
+        self._outgoing: dict[NodeID, dict[NodeID, LinkID]] = {}
+        self._incoming: dict[NodeID, dict[NodeID, LinkID]] = {}
+        self._simple_links: dict[SLink, LinkID] = {}
+        # The link ids as a list, so that a random link is picked without
+        # copying the links, and the position of each id in it.
+        self._link_ids: list[LinkID] = []
+        self._link_positions: dict[LinkID, int] = {}
+        for link in list(self.links.values()):
+            self.add_link(link)
+
+        # The ids of the nodes of each type, in insertion order, kept in sync
+        # with the nodes by `add_node` and `remove_node`.
+        self._nodes_by_type: dict[NodeType, dict[NodeID, None]] = {
+            node_type: {} for node_type in NodeType
+        }
+        for node in self.nodes.values():
+            self._nodes_by_type[node.node_type][node.id] = None
+        # The ids of the nodes that a new link can leave and enter, sampled by
+        # `mutate_add_link`. Built when first needed and dropped whenever a node
+        # is added or removed.
+        self._link_endpoints: Optional[tuple[tuple[NodeID, ...], ...]] = None
 
         if not self.nodes and not self.links:
             self.initialize_default_genome()
@@ -57,25 +156,57 @@ class Genome:
 
         return "\n".join(strings)
 
-    def initialize_default_genome(self):
-        input_nodes: dict[int, Node] = {}
-        output_nodes: dict[int, Node] = {}
+    def __getstate__(self) -> dict[str, Any]:
+        state = {attr: getattr(self, attr) for attr in self.__slots__}
+        # The networks are cheaper to rebuild than to send to other processes.
+        state["networks"] = {}
+        state["_gene_arrays"] = None
+        state["_link_endpoints"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    def clone(self, id: Optional[int] = None) -> Genome:
+        """Returns a copy of the genome with its own genes, which shares the
+        innovation record instead of copying it like `copy.deepcopy` would.
+        The copy keeps the id and fitness, unless a new id is given."""
+        genome = Genome(
+            self.id if id is None else id,
+            self.innov_record,
+            {k: n.copy() for k, n in self.nodes.items()},
+            {k: l.copy() for k, l in self.links.items()},
+        )
+        if id is None:
+            genome.fitness = self.fitness
+            genome.parents = self.parents
+
+        return genome
+
+    def clear_caches(self):
+        """Drops the networks and gene arrays built from the genome. Must be
+        called whenever its genes change, e.g. their attributes are mutated."""
+        self.networks.clear()
+        self._gene_arrays = None
 
+    def gene_arrays(self) -> GeneArrays:
+        if self._gene_arrays is None:
+            self._gene_arrays = GeneArrays.from_genes(self.nodes, self.links)
+
+        return self._gene_arrays
+
+    def initialize_default_genome(self):
         for node_id in self.input_keys:
-            node = self.create_new_node(node_id, NodeType.INPUT)
-            input_nodes[node_id] = node
+            self.add_node(self.create_new_node(node_id, NodeType.INPUT))
 
         for node_id in self.output_keys:
-            node = self.create_new_node(node_id, NodeType.OUTPUT)
-            output_nodes[node_id] = node
+            self.add_node(self.create_new_node(node_id, NodeType.OUTPUT))
 
-        for input in input_nodes.keys():
-            for output in output_nodes.keys():
+        for input in self.input_keys:
+            for output in self.output_keys:
                 link_id = self.get_link_id(input, output)
-                link = self.create_new_link(link_id, input, output)
-                self.links[link_id] = link
-
-        self.nodes = {**input_nodes, **output_nodes}
+                self.add_link(self.create_new_link(link_id, input, output))
 
     def crossover(self, other: Genome) -> Genome:
         """Configure a new genome by crossover from two parent genomes."""
@@ -109,66 +240,110 @@ class Genome:
         return genome
 
     def mutate(self):
-        if random.random() < self.params.node_addition_chance:
+        self.mutate_structure()
+        Node.mutate_batch(list(self.nodes.values()), self.params)
+        Link.mutate_batch(list(self.links.values()), self.params)
+        self.clear_caches()
+
+    @classmethod
+    def mutate_population(cls, genomes: list[Genome]):
+        """Mutates all the given genomes. The attributes of the genes of every
+        genome are mutated together, in a single batch per gene type."""
+        # The structural mutations of all the genomes are decided in one draw.
+        chances = cls.structural_mutation_chances()
+        decisions = RNG.random((len(genomes), chances.size)) < chances
+        for genome, genome_decisions in zip(genomes, decisions.tolist()):
+            genome.mutate_structure(genome_decisions)
+
+        nodes = [node for genome in genomes for node in genome.nodes.values()]
+        links = [link for genome in genomes for link in genome.links.values()]
+        Node.mutate_batch(nodes, cls.params)
+        Link.mutate_batch(links, cls.params)
+        for genome in genomes:
+            genome.clear_caches()
+
+    @classmethod
+    def structural_mutation_chances(cls) -> np.ndarray:
+        """Returns the chances of the mutations in `mutate_structure`, in order."""
+        return np.array(
+            [
+                cls.params.node_addition_chance,
+                cls.params.node_deletion_chance,
+                cls.params.link_addition_chance,
+                cls.params.link_deletion_chance,
+                cls.params.link_toggle_chance,
+            ]
+        )
+
+    def mutate_structure(self, decisions: Optional[list[bool]] = None):
+        """Applies the structural mutations. `decisions` tells which of them
+        happen, otherwise they are drawn with `structural_mutation_chances`."""
+        self.clear_caches()
+        if decisions is None:
+            chances = self.structural_mutation_chances()
+            decisions = (RNG.random(chances.size) < chances).tolist()
+
+        add_node, delete_node, add_link, delete_link, toggle_link = decisions
+        if add_node:
             self.mutate_add_node()
 
-        if random.random() < self.params.node_deletion_chance:
+        if delete_node:
             self.mutate_delete_node()
 
-        if random.random() < self.params.link_addition_chance:
+        if add_link:
             self.mutate_add_link()
 
-        if random.random() < self.params.link_deletion_chance:
+        if delete_link:
             self.mutate_delete_link()
 
-        if random.random() < self.params.link_toggle_chance:
+        if toggle_link:
             self.mutate_toggle_enable()
 
-        for node in self.nodes.values():
-            node.mutate(self.params)
-
-        for link in self.links.values():
-            link.mutate(self.params)
-
     def mutate_add_node(self):
         if not self.links:
             if self.params.alternative_structural_mutations:
                 self.mutate_add_link()
             return
 
-        link_to_split: Link = get_random_value(self.links)
+        link_to_split = self.get_random_link()
         link_to_split.disable()
 
         node_id = self.get_node_id(link_to_split.id)
-        node = self.create_new_node(node_id)
-        self.nodes[node_id] = node
+        self.add_node(self.create_new_node(node_id))
 
         flink_id = self.get_link_id(link_to_split.in_node, node_id)
         first_link = self.create_new_link(flink_id, link_to_split.in_node, node_id)
         first_link.weight = 1
-        self.links[flink_id] = first_link
+        self.add_link(first_link)
 
         slink_id = self.get_link_id(node_id, link_to_split.out_node)
         second_link = self.create_new_link(slink_id, node_id, link_to_split.out_node)
         second_link.weight = link_to_split.weight
-        self.links[slink_id] = second_link
+        self.add_link(second_link)
 
     def mutate_delete_node(self):
-        hidden_nodes = self.get_nodes_by_type(NodeType.HIDDEN)
+        hidden_nodes = self._nodes_by_type[NodeType.HIDDEN]
 
         if not hidden_nodes:
             return
 
-        node_id = random.choice(hidden_nodes)
-        self.links = {
-            k: l for k, l in self.links.items() if node_id not in l.simple_link
-        }
-        self.nodes.pop(node_id)
+        node_id = random.choice(list(hidden_nodes))
+        for link_id in self._outgoing.pop(node_id, {}).values():
+            self.remove_link(link_id)
 
-    def mutate_add_link(self):
-        in_nodes = [k for k, _ in self.nodes.items()]
-        out_nodes = [k for k, n in self.nodes.items() if n.node_type != NodeType.INPUT]
+        for link_id in self._incoming.pop(node_id, {}).values():
+            self.remove_link(link_id)
 
+        self.remove_node(node_id)
+
+    def mutate_add_link(self):
+        if self._link_endpoints is None:
+            nodes_by_type = self._nodes_by_type
+            self._link_endpoints = (
+                tuple(self.nodes),
+                (*nodes_by_type[NodeType.HIDDEN], *nodes_by_type[NodeType.OUTPUT]),
+            )
+        in_nodes, out_nodes = self._link_endpoints
         in_node = random.choice(in_nodes)
         out_node = random.choice(out_nodes)
 
@@ -176,37 +351,36 @@ class Genome:
             return
 
         new_link = (in_node, out_node)
-        for link in self.links.values():
-            if link.simple_link == new_link:
-                # TODO sometimes freezes, probably cycle?
-                if self.params.alternative_structural_mutations:
-                    link.enable()
-                return
+        if (existing_link_id := self._simple_links.get(new_link)) is not None:
+            # TODO sometimes freezes, probably cycle?
+            if self.params.alternative_structural_mutations:
+                self.links[existing_link_id].enable()
+            return
 
         if in_node in self.output_keys and out_node in self.output_keys:
             return
 
-        simple_links = [l.simple_link for l in self.links.values()]
-        if self.params.feed_forward and creates_cycle(simple_links, new_link):
+        # The outgoing links double as the adjacency of the genome's graph.
+        if self.params.feed_forward and creates_cycle(self._outgoing, new_link):
             return
 
         link_id = self.get_link_id(in_node, out_node)
         link = self.create_new_link(link_id, in_node, out_node)
         assert link_id not in self.links
-        self.links[link_id] = link
+        self.add_link(link)
 
     def mutate_delete_link(self):
         if not self.links:
             return
 
-        link: Link = get_random_value(self.links)
-        self.links.pop(link.id)
+        link = self.get_random_link()
+        self.remove_link(link.id)
 
     def mutate_toggle_enable(self):
         if not self.links:
             return
 
-        link_to_toggle_enable: Link = get_random_value(self.links)
+        link_to_toggle_enable = self.get_random_link()
 
         if not link_to_toggle_enable.enabled:
             link_to_toggle_enable.enable()
@@ -214,23 +388,15 @@ class Genome:
 
         # We need to make sure that another gene connects out of the in-node,
         # because if not, a section of network will break off and become isolated.
-        in_node_id = link_to_toggle_enable.in_node
-        sum_of_links_with_the_specific_in_node = 0
-
-        for link in self.links.values():
-            if link.in_node == in_node_id:
-                sum_of_links_with_the_specific_in_node += 1
-
-            if sum_of_links_with_the_specific_in_node >= 2:
-                link_to_toggle_enable.disable()
-                return
+        if len(self._outgoing[link_to_toggle_enable.in_node]) >= 2:
+            link_to_toggle_enable.disable()
 
     @property
     def size(self):
         """Returns genome 'complexity', taken to be
         (number of nodes, number of enabled connections).
         """
-        num_enabled_connections = sum([1 for l in self.links.values() if l.enabled])
+        num_enabled_connections = sum(l.enabled for l in self.links.values())
         return len(self.nodes), num_enabled_connections
 
     def create_new_node(self, id: NodeID, ntype: NodeType = NodeType.HIDDEN) -> Node:
@@ -241,12 +407,54 @@ class Genome:
         return self.innov_record.get_node_id(link_to_split)
 
     def get_nodes_by_type(self, node_type: NodeType) -> list[NodeID]:
-        return [k for k, n in self.nodes.items() if n.node_type == node_type]
+        return list(self._nodes_by_type[node_type])
+
+    def add_node(self, node: Node):
+        self.clear_caches()
+        self.nodes[node.id] = node
+        self._nodes_by_type[node.node_type][node.id] = None
+        self._link_endpoints = None
+
+    def remove_node(self, node_id: NodeID) -> Node:
+        self.clear_caches()
+        node = self.nodes.pop(node_id)
+        del self._nodes_by_type[node.node_type][node_id]
+        self._link_endpoints = None
+        return node
 
     def create_new_link(self, id: LinkID, in_node: NodeID, out_node: NodeID) -> Link:
         weight, enabled, frozen = Link.get_default_args(self.params)
         return Link(id, in_node, out_node, weight, enabled, frozen)
 
+    def add_link(self, link: Link):
+        self.clear_caches()
+        self.links[link.id] = link
+        self._outgoing.setdefault(link.in_node, {})[link.out_node] = link.id
+        self._incoming.setdefault(link.out_node, {})[link.in_node] = link.id
+        self._simple_links[link.simple_link] = link.id
+        if link.id not in self._link_positions:
+            self._link_positions[link.id] = len(self._link_ids)
+            self._link_ids.append(link.id)
+
+    def remove_link(self, link_id: LinkID) -> Link:
+        self.clear_caches()
+        link = self.links.pop(link_id)
+        # The entries of a node are missing while it is being deleted.
+        self._outgoing.get(link.in_node, {}).pop(link.out_node, None)
+        self._incoming.get(link.out_node, {}).pop(link.in_node, None)
+        del self._simple_links[link.simple_link]
+        # Move the last id into the place of the removed one.
+        position = self._link_positions.pop(link_id)
+        last_link_id = self._link_ids.pop()
+        if last_link_id != link_id:
+            self._link_ids[position] = last_link_id
+            self._link_positions[last_link_id] = position
+
+        return link
+
+    def get_random_link(self) -> Link:
+        return self.links[random.choice(self._link_ids)]
+
     def get_link_id(self, in_node: NodeID, out_node: NodeID) -> int:
         return self.innov_record.get_link_id(in_node, out_node)
 
@@ -257,24 +465,25 @@ class Genome:
                 break
 
 
-def creates_cycle(connections: list[SLink], test: SLink) -> bool:
+def creates_cycle(adjacency: Mapping[NodeID, Iterable[NodeID]], test: SLink) -> bool:
     """Returns true if the addition of the 'test' connection would create a cycle,
-    assuming that no cycle already exists in the graph represented by 'connections'.
+    assuming that no cycle already exists in the graph represented by 'adjacency',
+    which maps every node to the nodes it connects to.
     """
     i, o = test
     if i == o:
         return True
 
+    # Depth first search for a path from the out node back to the in node.
     visited = {o}
-    while True:
-        num_added = 0
-        for a, b in connections:
-            if a in visited and b not in visited:
-                if b == i:
-                    return True
-
-                visited.add(b)
-                num_added += 1
-
-        if num_added == 0:
-            return False
+    stack = [o]
+    while stack:
+        for node in adjacency.get(stack.pop(), ()):
+            if node == i:
+                return True
+
+            if node not in visited:
+                visited.add(node)
+                stack.append(node)
+
+    return False
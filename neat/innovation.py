@@ -1,37 +1,44 @@
+from typing import Hashable
+
 from neat.types import GenomeID, LinkID, NodeID, SLink, SpeciesID
 
 
+class IdRecord(dict[Hashable, int]):
+    """A dict that gives the next free id to every key that is missing, so that
+    recording a new innovation takes a single lookup."""
+
+    def __init__(self, first_id: int = 0):
+        super().__init__()
+        self.counter = first_id
+
+    def __missing__(self, key: Hashable) -> int:
+        id = self[key] = self.counter
+        self.counter += 1
+        return id
+
+
 class InnovationRecord:
     def __init__(self, inputs: int, outputs: int):
-        self.nodes_counter = inputs + outputs
-        self.nodes_record: dict[LinkID, NodeID] = {}
-        self.links_counter = 0
-        self.links_record: dict[SLink, LinkID] = {}
+        self.nodes_record: dict[LinkID, NodeID] = IdRecord(inputs + outputs)
+        self.links_record: dict[SLink, LinkID] = IdRecord()
         self.species_counter = 0
         self.genomes_counter = 0
 
-    def get_node_id(self, link_to_split: LinkID) -> NodeID:
-        node_id = self.nodes_record.get(link_to_split)
+    @property
+    def nodes_counter(self) -> NodeID:
+        """The id that the next new node gets."""
+        return self.nodes_record.counter
 
-        if node_id is not None:
-            return node_id
+    @property
+    def links_counter(self) -> LinkID:
+        """The id that the next new link gets."""
+        return self.links_record.counter
 
-        node_id = self.nodes_counter
-        self.nodes_record[link_to_split] = node_id
-        self.nodes_counter += 1
-        return node_id
+    def get_node_id(self, link_to_split: LinkID) -> NodeID:
+        return self.nodes_record[link_to_split]
 
     def get_link_id(self, in_node: NodeID, out_node: NodeID) -> LinkID:
-        link = (in_node, out_node)
-        link_id = self.links_record.get(link)
-
-        if link_id is not None:
-            return link_id
-
-        link_id = self.links_counter
-        self.links_record[link] = link_id
-        self.links_counter += 1
-        return link_id
+        return self.links_record[(in_node, out_node)]
 
     def get_species_id(self) -> SpeciesID:
         species_id = self.species_counter
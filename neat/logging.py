@@ -1,17 +1,17 @@
 from __future__ import annotations
 
 import logging
+import math
 import pickle
 import sys
 import time
 from dataclasses import dataclass, field
-
-from numba.core.utils import math
+from functools import lru_cache
+from statistics import fmean, pstdev
 
 from neat.genomes import Genome
 from neat.parameters import Parameters
 from neat.species import Species
-from neat.utils import mean, stdev
 
 file_handler = logging.FileHandler(filename="training.log")
 stdout_handler = logging.StreamHandler(sys.stdout)
@@ -48,11 +48,17 @@ class StatisticalData:
 class Reporter:
     show_parameters: bool = False
     show_species_details: bool = True
+    # When disabled the generation reports are not formatted or printed, but
+    # the statistics are still collected.
+    show_generations: bool = True
 
     _header_width: int = 50
+    _species_row = "  {:>4}  {:>3}  {:>4}  {:>9}  {:>4}".format
 
     def __init__(self):
         self.data = StatisticalData()
+        # Running sum of the generation times, to average them in O(1).
+        self._total_generation_time = 0.0
 
     def initialize_training(self, params: Parameters):
         if self.show_parameters:
@@ -62,54 +68,68 @@ class Reporter:
         print(self.format_header(f"Starting Training"))
 
     def start_generation(self, generation_id: int):
-        print(self.format_header(f"Running Generation {generation_id}"))
+        if self.show_generations:
+            print(self.format_header(f"Running Generation {generation_id}"))
+
         self._generation_start_time = time.time()
 
     def end_generation(self, genomes: list[Genome], species_set: list[Species]):
         fitnesses = [genome.fitness for genome in genomes]
-        fit_mean = mean(fitnesses)
-        fit_std = stdev(fitnesses)
-        print(f"Genomes Average fitness: {fit_mean:3.5f}")
-        print(f"Genomes Standard deviation: {fit_std:3.5f}\n")
-        print(self.format_header("Species"))
+        fit_mean = fmean(fitnesses)
+        fit_std = pstdev(fitnesses, fit_mean)
         self.data.average_fitnesses.append(fit_mean)
         self.data.standard_deviations.append(fit_std)
 
         elapsed_time = time.time() - self._generation_start_time
         self.data.generation_times.append(elapsed_time)
-        mean_time = mean(self.data.generation_times)
+        self._total_generation_time += elapsed_time
+        mean_time = self._total_generation_time / len(self.data.generation_times)
+
+        species_info = [
+            (s.id, s.age, s.size, f"{s.fitness:.3f}", s.stagnant) for s in species_set
+        ]
+        self.data.species_info.append(species_info)
+
+        if not self.show_generations:
+            return
+
+        # The report is printed at once, instead of a print call per line.
+        lines: list[str] = []
+        lines.append(f"Genomes Average fitness: {fit_mean:3.5f}")
+        lines.append(f"Genomes Standard deviation: {fit_std:3.5f}\n")
+        lines.append(self.format_header("Species"))
 
         time_info = f"Generation time: {elapsed_time:.3f} sec ({mean_time:.3f} average)"
         pop_info = f"Population of {len(genomes)} members in {len(species_set)} species"
-        print(time_info)
-        print(pop_info)
+        lines.append(time_info)
+        lines.append(pop_info)
 
         if not self.show_species_details:
+            print("\n".join(lines))
             return
 
-        print("   ID   age  size   fitness   stag")
-        print("  ====  ===  ====  =========  ====")
+        lines.append("   ID   age  size   fitness   stag")
+        lines.append("  ====  ===  ====  =========  ====")
+        for row in species_info:
+            lines.append(self._species_row(*row))
 
-        species_info = []
-        for species in species_set:
-            id = species.id
-            age = species.age
-            size = species.size
-            f = f"{species.fitness:.3f}"
-            stag = species.stagnant
-            print(f"  {id:>4}  {age:>3}  {size:>4}  {f:>9}  {stag:>4}")
-            species_info.append((id, age, size, f, stag))
-
-        self.data.species_info.append(species_info)
-        print(f"\nStagnations: {self.data.stagnations}")
+        lines.append(f"\nStagnations: {self.data.stagnations}")
+        print("\n".join(lines))
 
     def best_genome(self, genome: Genome):
-        print(
-            f"\nBest genome is {genome.id} {genome.size}"
-            f" with fitness {genome.fitness}\n"
-        )
+        if self.show_generations:
+            print(
+                f"\nBest genome is {genome.id} {genome.size}"
+                f" with fitness {genome.fitness}\n"
+            )
+
         self.data.best_genome_fitnesses.append((genome.fitness, genome.size))
 
+    def reproduction(self, avg_adjusted_fitness: float, same_parents: int):
+        if self.show_generations:
+            print(f"Average adjusted fitness: {avg_adjusted_fitness:.3f}")
+            print(f"Times parents were the same {same_parents}")
+
     def stagnant_species(self, species: int, size: int):
         self.data.stagnations += 1
         if self.show_species_details:
@@ -118,13 +138,20 @@ class Reporter:
             )
 
     def format_header(self, text: str) -> str:
-        num_of_chars_to_add = max(self._header_width - len(text) - 4, 0)
-        num_of_left_chars = math.ceil(num_of_chars_to_add / 2)
-        num_of_right_chars = num_of_chars_to_add // 2
-        left_chars = "=" * num_of_left_chars
-        right_chars = "=" * num_of_right_chars
-        return f"+{left_chars} {text} {right_chars}+\n"
+        return format_header(text, self._header_width)
 
     def reset(self):
         self.data.save_to_file()
         self.data = StatisticalData()
+        self._total_generation_time = 0.0
+
+
+@lru_cache(maxsize=64)
+def format_header(text: str, width: int) -> str:
+    # Cached, since most headers, like the species one, repeat every generation.
+    num_of_chars_to_add = max(width - len(text) - 4, 0)
+    num_of_left_chars = math.ceil(num_of_chars_to_add / 2)
+    num_of_right_chars = num_of_chars_to_add // 2
+    left_chars = "=" * num_of_left_chars
+    right_chars = "=" * num_of_right_chars
+    return f"+{left_chars} {text} {right_chars}+\n"
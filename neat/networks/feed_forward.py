@@ -1,23 +1,97 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Callable, Optional
+
 import numpy as np
 
+from neat.activations import get_activation_func, linear
+from neat.aggregations import AggregationFuncs, get_aggregation_func
 from neat.genes import NodeType
 from neat.genomes.genome import Genome
+from neat.types import NodeID
 
+from .kernels import ACTIVATION_CODES, propagate_sum_layer
 from .network import Network
 from .utils import get_feed_forward_layers
 
 
+@dataclass
+class Layer:
+    """A set of nodes whose values depend only on the previous layers. The
+    nodes are stored as arrays, so that the whole layer is computed with a few
+    NumPy operations. Rows are positions in the layer, slots are positions in
+    the state vector of the network."""
+
+    nodes: list[NodeID]
+    slots: np.ndarray
+    biases: np.ndarray
+    responses: np.ndarray
+    # The nodes with sum aggregation, that are computed with a single matmul.
+    sum_rows: np.ndarray
+    sum_weights: np.ndarray
+    # The rest of the nodes as (row, source slots, weights, aggregator).
+    other_nodes: list[tuple[int, np.ndarray, np.ndarray, Callable]]
+    # The activation functions of the layer and the rows they apply to.
+    activators: list[tuple[Callable, np.ndarray]]
+    # The activation code of every row, when the whole layer can be computed
+    # by the fused `propagate_sum_layer` kernel.
+    activation_codes: Optional[np.ndarray] = None
+
+    def __repr__(self) -> str:
+        return f"Layer(nodes={self.nodes})"
+
+    def propagate(self, state: np.ndarray):
+        """Computes the values of the layer's nodes and writes them to the state,
+        which is either a single state vector or a matrix with a state per row."""
+        if self.activation_codes is not None:
+            propagate_sum_layer(
+                state.reshape(-1, state.shape[-1]),
+                self.slots,
+                self.sum_weights,
+                self.biases,
+                self.responses,
+                self.activation_codes,
+            )
+            return
+
+        values = np.empty(state.shape[:-1] + self.slots.shape, dtype=state.dtype)
+        if self.sum_rows.size:
+            values[..., self.sum_rows] = state @ self.sum_weights.T
+
+        for row, sources, weights, aggregator in self.other_nodes:
+            values[..., row] = aggregator(state[..., sources] * weights, axis=-1)
+
+        values = values * self.responses + self.biases
+        for activator, rows in self.activators:
+            state[..., self.slots[rows]] = activator(values[..., rows])
+
+
 class FeedForwardNetwork(Network):
+    """A network without cycles. Its weights and values are stored as float32,
+    which halves the memory traffic of the forward pass compared to float64."""
+
+    def __init__(
+        self,
+        id: int,
+        inputs: list[NodeID],
+        outputs: list[NodeID],
+        layers: list[Layer],
+        slots: dict[NodeID, int],
+    ):
+        super().__init__(id, inputs, outputs)
+        self.layers = layers
+        self.size = len(slots)
+        self.output_slots = np.array([slots[node] for node in outputs], dtype=np.intp)
+
     def __repr__(self) -> str:
         strings: list[str] = []
 
         strings.append(f"Inputs: {self.inputs}")
         strings.append(f"Output: {self.outputs}")
 
-        for eval in self.evaluators:
-            strings.append(str(eval))
+        for layer in self.layers:
+            strings.append(str(layer))
 
         return "\n".join(strings)
 
@@ -28,17 +102,102 @@ class FeedForwardNetwork(Network):
         links = [l for l in genome.links.values() if l.enabled]
         slinks = [l.simple_link for l in links]
 
-        layers = get_feed_forward_layers(input_nodes, output_nodes, slinks)
-        node_evals = []
+        layers = [
+            sorted(layer)
+            for layer in get_feed_forward_layers(input_nodes, output_nodes, slinks)
+        ]
+
+        # Every node that is part of the computation gets a slot in the state
+        # of the network. The inputs come first and unconnected outputs last.
+        slots: dict[NodeID, int] = {}
+        for node in input_nodes:
+            slots[node] = len(slots)
+
         for layer in layers:
             for node in layer:
-                inputs = []
-                for link in [l for l in links if l.out_node == node]:
-                    inputs.append((link.in_node, link.weight))
+                slots[node] = len(slots)
+
+        for node in output_nodes:
+            slots.setdefault(node, len(slots))
+
+        incoming: dict[NodeID, list[tuple[NodeID, float]]] = {}
+        for link in links:
+            incoming.setdefault(link.out_node, []).append((link.in_node, link.weight))
+
+        compiled_layers = [
+            FeedForwardNetwork.compile_layer(genome, layer, slots, incoming)
+            for layer in layers
+        ]
+        return FeedForwardNetwork(
+            genome.id, input_nodes, output_nodes, compiled_layers, slots
+        )
 
-                node_evals.append((node, genome.nodes[node].get_evaluator(), inputs))
+    @staticmethod
+    def compile_layer(
+        genome: Genome,
+        nodes: list[NodeID],
+        slots: dict[NodeID, int],
+        incoming: dict[NodeID, list[tuple[NodeID, float]]],
+    ) -> Layer:
+        size = len(nodes)
+        biases = np.zeros(size, dtype=np.float32)
+        responses = np.ones(size, dtype=np.float32)
+        sum_rows: list[int] = []
+        sum_weights: list[np.ndarray] = []
+        other_nodes: list[tuple[int, np.ndarray, np.ndarray, Callable]] = []
+        activator_rows: dict[Callable, list[int]] = {}
+        activators: list[Callable] = []
+
+        for row, node_id in enumerate(nodes):
+            node = genome.nodes[node_id]
+            node_links = incoming[node_id]
+
+            if node.aggregator == AggregationFuncs.SUM:
+                weights = np.zeros(len(slots), dtype=np.float32)
+                for in_node, weight in node_links:
+                    weights[slots[in_node]] += weight
+
+                sum_rows.append(row)
+                sum_weights.append(weights)
+            else:
+                sources = np.array([slots[n] for n, _ in node_links], dtype=np.intp)
+                weights = np.array([w for _, w in node_links], dtype=np.float32)
+                aggregator = get_aggregation_func(node.aggregator)
+                other_nodes.append((row, sources, weights, aggregator))
+
+            # Only the hidden nodes are activated, the outputs are just aggregated.
+            if node.node_type == NodeType.HIDDEN:
+                biases[row] = node.bias
+                responses[row] = node.response
+                activator = get_activation_func(node.activator)
+            else:
+                activator = linear
+
+            activator_rows.setdefault(activator, []).append(row)
+            activators.append(activator)
+
+        activation_codes = None
+        if not other_nodes and all(a in ACTIVATION_CODES for a in activators):
+            activation_codes = np.array(
+                [ACTIVATION_CODES[a] for a in activators], dtype=np.int8
+            )
 
-        return FeedForwardNetwork(genome.id, input_nodes, output_nodes, node_evals)
+        return Layer(
+            nodes=nodes,
+            slots=np.array([slots[node] for node in nodes], dtype=np.intp),
+            biases=biases,
+            responses=responses,
+            sum_rows=np.array(sum_rows, dtype=np.intp),
+            sum_weights=np.array(sum_weights, dtype=np.float32).reshape(
+                len(sum_rows), len(slots)
+            ),
+            other_nodes=other_nodes,
+            activators=[
+                (activator, np.array(rows, dtype=np.intp))
+                for activator, rows in activator_rows.items()
+            ],
+            activation_codes=activation_codes,
+        )
 
     def activate(self, input: np.ndarray) -> list[float]:
         if len(input) != len(self.inputs):
@@ -46,14 +205,25 @@ class FeedForwardNetwork(Network):
                 f"Expected {len(self.inputs)} inputs but got {len(input)}."
             )
 
-        for node, value in zip(self.inputs, input):
-            self.values[node] = value
+        state = np.zeros(self.size, dtype=np.float32)
+        state[: len(self.inputs)] = input
+        for layer in self.layers:
+            layer.propagate(state)
+
+        return state[self.output_slots].tolist()
 
-        for node, evaluator, links in self.evaluators:
-            node_inputs = []
-            for neighbor, weight in links:
-                node_inputs.append(self.values[neighbor] * weight)
+    def activate_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """Passes every row of the given input matrix to the network and returns
+        the outputs as a matrix of shape (rows, outputs)."""
+        if inputs.ndim != 2 or inputs.shape[1] != len(self.inputs):
+            raise RuntimeError(
+                f"Expected inputs of shape (N, {len(self.inputs)}) "
+                f"but got {inputs.shape}."
+            )
 
-            self.values[node] = evaluator(node_inputs)
+        state = np.zeros((inputs.shape[0], self.size), dtype=np.float32)
+        state[:, : len(self.inputs)] = inputs
+        for layer in self.layers:
+            layer.propagate(state)
 
-        return [self.values[node] for node in self.outputs]
+        return state[:, self.output_slots]
@@ -0,0 +1,49 @@
+import numpy as np
+from numba import njit
+
+from neat.activations import linear, relu, sigmoid, tanh
+
+# The activations that `propagate_sum_layer` can apply, by their code.
+ACTIVATION_CODES = {sigmoid: 0, relu: 1, tanh: 2, linear: 3}
+
+
+@njit(cache=True, fastmath=True)
+def _activate(code: int, value: float) -> float:
+    if code == 0:
+        return sigmoid(value)
+    elif code == 1:
+        return relu(value)
+    elif code == 2:
+        return tanh(value)
+
+    return linear(value)
+
+
+@njit(cache=True, fastmath=True)
+def propagate_sum_layer(
+    state: np.ndarray,
+    slots: np.ndarray,
+    weights: np.ndarray,
+    biases: np.ndarray,
+    responses: np.ndarray,
+    activation_codes: np.ndarray,
+):
+    """Computes a layer whose nodes all sum their inputs, for a matrix with a
+    state per row. The weighted sum, response, bias and activation of a node
+    are computed in a single pass, without temporary arrays."""
+    size = slots.size
+    values = np.empty(size, dtype=state.dtype)
+    for row in range(state.shape[0]):
+        for i in range(size):
+            total = 0.0
+            for j in range(weights.shape[1]):
+                total += weights[i, j] * state[row, j]
+
+            value = total * responses[i] + biases[i]
+            values[i] = _activate(activation_codes[i], value)
+
+        # The nodes of a layer don't depend on each other, but the values are
+        # written after the whole layer is computed, to not feed zero weights
+        # with the new values.
+        for i in range(size):
+            state[row, slots[i]] = values[i]
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Callable
 
 import numpy as np
 
@@ -10,24 +9,33 @@ from neat.types import NodeID
 
 
 class Network(ABC):
-    def __init__(
-        self,
-        id: int,
-        inputs: list[NodeID],
-        outputs: list[NodeID],
-        evaluators: list[tuple[NodeID, Callable, list[tuple[NodeID, float]]]],
-    ):
+    def __init__(self, id: int, inputs: list[NodeID], outputs: list[NodeID]):
         self.id = id
         self.inputs = inputs
         self.outputs = outputs
-        self.evaluators = evaluators
-        self.values = {node_id: 0.0 for node_id in inputs + outputs}
 
     @staticmethod
     @abstractmethod
     def from_genome(genome: Genome) -> Network:
         """Receives a genome and returns its phenotype (Network)."""
 
+    @classmethod
+    def from_genome_cached(cls, genome: Genome) -> Network:
+        """Like `from_genome`, but the network is stored on the genome and
+        reused by later calls, until the genome is mutated. It only helps when
+        the same genome object is activated several times in one process, e.g.
+        by an in-process evaluation against several opponents. The networks are
+        not pickled, so workers of a `ParallelEvaluator` always build them."""
+        network = genome.networks.get(cls)
+        if network is None:
+            network = genome.networks[cls] = cls.from_genome(genome)
+
+        return network
+
     @abstractmethod
     def activate(self, input: np.ndarray) -> list[float]:
         """Passes the given input to the network."""
+
+    @abstractmethod
+    def activate_batch(self, inputs: np.ndarray) -> np.ndarray:
+        """Passes every row of the given input matrix to the network."""
@@ -14,21 +14,19 @@ def required_for_output(
     """
     assert not set(inputs).intersection(outputs)
 
-    required = set(outputs)
-    s = set(outputs)
-    while True:
-        # Find nodes not in s whose output is consumed by a node in s.
-        t = set(a for (a, b) in links if b in s and a not in s)
-
-        if not t:
-            break
+    predecessors: dict[NodeID, list[NodeID]] = {}
+    for a, b in links:
+        predecessors.setdefault(b, []).append(a)
 
-        layer_nodes = set(x for x in t if x not in inputs)
-        if not layer_nodes:
-            break
-
-        required = required.union(layer_nodes)
-        s = s.union(t)
+    # Walk the links backwards from the outputs, stopping at the inputs.
+    input_set = set(inputs)
+    required = set(outputs)
+    stack = list(outputs)
+    while stack:
+        for a in predecessors.get(stack.pop(), ()):
+            if a not in required and a not in input_set:
+                required.add(a)
+                stack.append(a)
 
     return required
 
@@ -48,22 +46,29 @@ def get_feed_forward_layers(
 
     required = required_for_output(inputs, outputs, links)
 
+    successors: dict[NodeID, list[NodeID]] = {}
+    # The number of inputs of every node that are not computed yet.
+    pending_inputs: dict[NodeID, int] = {}
+    for a, b in links:
+        successors.setdefault(a, []).append(b)
+        pending_inputs[b] = pending_inputs.get(b, 0) + 1
+
     layers: list[set[NodeID]] = []
-    s = set(inputs)
+    layer = inputs
     while True:
-        # Find candidate nodes c for the next layer.  These nodes should connect
-        # a node in s to a node not in s.
-        c = set(b for (a, b) in links if a in s and b not in s)
-        # Keep only the used nodes whose entire input set is contained in s.
+        # The next layer holds the used nodes whose last pending input was
+        # computed in the previous layer.
         t: set[NodeID] = set()
-        for n in c:
-            if n in required and all(a in s for (a, b) in links if b == n):
-                t.add(n)
+        for a in layer:
+            for b in successors.get(a, ()):
+                pending_inputs[b] -= 1
+                if not pending_inputs[b] and b in required:
+                    t.add(b)
 
         if not t:
             break
 
         layers.append(t)
-        s = s.union(t)
+        layer = t
 
     return layers
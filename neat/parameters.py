@@ -1,74 +1,115 @@
-import collections
+import copy
+import os
 import re
-import sys
-from configparser import ConfigParser
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import lru_cache, partial
 from inspect import get_annotations
 from pathlib import Path
-from types import GenericAlias
-from typing import Annotated, Any, Optional, Type
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Mapping,
+    Optional,
+    Type,
+    get_args,
+    get_origin,
+)
 
 from neat.activations import ActivationFuncs
 from neat.aggregations import AggregationFuncs
+from neat.config_parser import parse_config
 from neat.fitness import FitnessCriterionFuncs, LossFuncs
 from neat.genomes.connection_schemes import ConnectionSchemes
 
+# Matches the start of every capitalized word, e.g. "Is" and "Sentence" in
+# "IsASentence".
+_CAMEL_CASE_WORD = re.compile(r"([A-Z][a-z])")
+# The parsed sections of the latest version of every read config, keyed by
+# resolved path along with the mtime and size of the version, so that an edited
+# file is read again and replaces its previous entry.
+_PARAMETERS_CACHE: dict[Path, tuple[tuple[int, int], dict[str, "ConfigSection"]]] = {}
 
-@dataclass
+
+@dataclass(slots=True)
 class ValueRange:
     lo: float
     hi: float
 
 
-class CaseInsensitiveDict(collections.UserDict):
-    """Ordered case insensitive mutable mapping class."""
+@dataclass(slots=True)
+class AttributeParams:
+    """The parameters of a single gene attribute, e.g. `bias_init_mean` of
+    the genome section is the `init_mean` of the "bias" attribute."""
+
+    mutation_chance: float = 0.0
+    replace_chance: float = 0.0
+    severe_mutation_chance: float = 0.0
+    mutation_power: float = 0.0
+    init_mean: float = 0.0
+    init_stdev: float = 0.0
+    min_value: float = 0.0
+    max_value: float = 0.0
+    default: Any = None
+    options: Optional[list[Any]] = None
+
+
+@lru_cache(maxsize=1024)
+def _to_snake(key: str) -> str:
+    """Converts the key to lower case and replaces camel case and
+    spaces with snake case.
+
+    >>> _to_snake("This Is ASentence")
+    "this_is_a_sentence"
+    """
+    key_words = _CAMEL_CASE_WORD.sub(r" \1", key).split()
+    return "_".join(word.lower() for word in key_words)
 
-    def __setitem__(self, key: str, value: Any):
-        key = self.convert_to_snake_case(key)
-        super().__setitem__(key, value)
 
-    def __getitem__(self, key: str) -> Any:
-        key = self.convert_to_snake_case(key)
-        return super().__getitem__(key)
+@lru_cache(maxsize=None)
+def _get_ann(cls: Type) -> dict[str, Any]:
+    """Returns the annotations of the class, which are fixed once it is defined."""
+    return get_annotations(cls)
 
-    @staticmethod
-    def convert_to_snake_case(key: str) -> str:
-        """Converts the key to lower case and replaces camel case and
-        spaces with snake case.
 
-        >>> convert_to_snake_case("This Is ASentence")
-        "this_is_a_sentence"
-        """
-        key_words = re.sub(r"([A-Z][a-z])", r" \1", key).split()
-        key_words = [word.lower() for word in key_words]
-        return "_".join(key_words)
+def _parse_list(item_type: Type, value: str) -> list[Any]:
+    return [item_type(item) for item in value.split(",")]
 
 
 class ConfigSection:
+    # The (attr, converter, default) of every parameter of the section.
+    _converters: list[tuple[str, Callable[[str], Any], Any]] = []
+
+    def __init_subclass__(cls):
+        # Resolve how every parameter is read once, when the section is defined,
+        # instead of inspecting its annotation on every populate.
+        super().__init_subclass__()
+        cls._converters = []
+        for attr, attr_type in _get_ann(cls).items():
+            if item_type := cls.get_types_from_list_annotation(attr_type):
+                converter = partial(_parse_list, item_type)
+            else:
+                converter = attr_type
+
+            cls._converters.append((attr, converter, getattr(cls, attr, None)))
+
     @classmethod
-    def populate(cls, params: ConfigParser, section: str):
+    def populate(cls, options: Mapping[str, str]):
         config = cls()
 
-        for attr, attr_type in get_annotations(cls).items():
-            default_value = getattr(cls, attr, None)
-            input_value = params.get(section, attr, fallback=default_value)
+        for attr, converter, default_value in cls._converters:
+            input_value = options.get(attr, default_value)
             if input_value is None:
                 raise ValueError(f"Parameter '{attr}' is not defined in config file.")
 
-            if enum_type := cls.get_types_from_list_annotation(attr_type):
-                values = input_value.split(",")
-                values = [enum_type(value) for value in values]
-                setattr(config, attr, values)
-                continue
-
-            setattr(config, attr, attr_type(input_value))
+            setattr(config, attr, converter(input_value))
 
         return config
 
     def __repr__(self) -> str:
         repr = [f"[{self.__class__.__name__}]"]
 
-        for attr in get_annotations(self.__class__).keys():
+        for attr in _get_ann(self.__class__).keys():
             value = getattr(self, attr)
 
             if isinstance(value, list):
@@ -80,17 +121,9 @@ class ConfigSection:
 
     @classmethod
     def get_types_from_list_annotation(cls, value: Any) -> Optional[Type]:
-        if not isinstance(value, GenericAlias):
-            return
-
-        value = str(value)
-        if not (r"list[" == value[:5] and value[-1] == "]"):
-            return
-
-        # The type name that is surrounded by list[].
-        type_str = value[5:-1].rsplit(".", maxsplit=1)[-1]
-        attr_type = getattr(sys.modules[__name__], type_str)
-        return attr_type
+        """Returns the element type of a `list[...]` annotation, else None."""
+        if get_origin(value) is list:
+            return get_args(value)[0]
 
 
 class NEATParams(ConfigSection):
@@ -153,6 +186,32 @@ class GenomeParams(ConfigSection):
     weight_replace_chance: Annotated[float, ValueRange(0.0, 1.0)]
     weight_mutation_power: float
 
+    # Bumped whenever a parameter is set, so that whatever was built from the
+    # parameters, e.g. the mutators of the genes, is rebuilt from the new ones.
+    version = 0
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        self.__dict__.pop("_attribute_params", None)
+        self.__dict__["version"] = self.version + 1
+
+    def attribute_params(self, attr: str) -> AttributeParams:
+        """Returns the parameters of the given gene attribute. They are collected
+        once per attribute, so hot paths avoid the `f"{attr}_..."` lookups, and
+        again after any parameter is set."""
+        cache = self.__dict__.setdefault("_attribute_params", {})
+        if (attr_params := cache.get(attr)) is not None:
+            return attr_params
+
+        values = {}
+        for field in fields(AttributeParams):
+            name = f"{attr}_{field.name}"
+            if hasattr(self, name):
+                values[field.name] = getattr(self, name)
+
+        attr_params = cache[attr] = AttributeParams(**values)
+        return attr_params
+
 
 class SpeciationParams(ConfigSection):
     compatibility_disjoint_coefficient: float
@@ -189,21 +248,40 @@ class Parameters:
     reproduction: ReproductionParams
 
     def __init__(self, config_file: Path):
-        params = ConfigParser(dict_type=CaseInsensitiveDict)
-        params.read(config_file)
+        path = Path(config_file).resolve()
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _PARAMETERS_CACHE.get(path)
+        if cached is not None and cached[0] == version:
+            sections = cached[1]
+        else:
+            sections = self.read_sections(path)
+            _PARAMETERS_CACHE[path] = (version, sections)
+
+        # Every instance gets its own deep copy of the sections, so that changing
+        # the parameters of one, or their list options, doesn't change the
+        # cached ones.
+        for section, value in sections.items():
+            setattr(self, section, copy.deepcopy(value))
+
+    @classmethod
+    def read_sections(cls, config_file: Path) -> dict[str, ConfigSection]:
+        params = parse_config(config_file, normalize=_to_snake)
+        sections: dict[str, ConfigSection] = {}
 
-        for section, attr_type in get_annotations(self.__class__).items():
+        for section, attr_type in _get_ann(cls).items():
             attr_type: ConfigSection
-            if not section in params.sections():
+            if not section in params:
                 raise ValueError(f"Section '{section}' not present in config.")
 
-            value = attr_type.populate(params, section)
-            setattr(self, section, value)
+            sections[section] = attr_type.populate(params[section])
+
+        return sections
 
     def __repr__(self) -> str:
         repr = []
 
-        for attr in get_annotations(self.__class__).keys():
+        for attr in _get_ann(self.__class__).keys():
             value = getattr(self, attr)
             repr.append(f"\n{str(value)}")
 
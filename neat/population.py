@@ -1,15 +1,55 @@
-import copy
 import pickle
-from typing import Callable, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import attrgetter
+from typing import Any, Callable, Optional
 
 from neat.genomes.genome import Genome
 from neat.innovation import InnovationRecord
-from neat.logging import Reporter, StatisticalData
+from neat.logging import LOGGER, Reporter, StatisticalData
 from neat.parameters import Parameters
 from neat.reproduction import filter_stagnant_species, reproduce
 from neat.speciation import get_representatives, speciate
 
 
+class BackgroundWriter:
+    """Writes pickled objects to files on a single background thread. The
+    objects are pickled right away, so they can keep changing afterwards."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.writes: list[Future] = []
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.close()
+            return
+
+        # The block is already failing, so the write errors are only logged,
+        # instead of replacing the original exception.
+        self.executor.shutdown(wait=True)
+        for write in self.writes:
+            if (error := write.exception()) is not None:
+                LOGGER.error(f"Failed to write a file: {error}")
+
+    def save(self, obj: Any, filepath: str):
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        self.writes.append(self.executor.submit(_write_file, filepath, data))
+
+    def close(self):
+        """Waits for the pending writes and raises the first error, if any."""
+        self.executor.shutdown(wait=True)
+        for write in self.writes:
+            write.result()
+
+
+def _write_file(filepath: str, data: bytes):
+    with open(filepath, "wb") as f:
+        f.write(data)
+
+
 class Population:
     def __init__(self, params: Parameters):
         self.params = params
@@ -33,37 +73,45 @@ class Population:
         reporter = Reporter()
         reporter.initialize_training(params)
 
-        iterations = 0
-        while not found_optimal_network:
-            if times is not None and iterations > times:
-                break
-
-            reporter.start_generation(self.generation)
-
-            representatatives = get_representatives(species)
-            fitness_func(genomes, representatatives)
-            genomes.sort(key=lambda g: g.fitness, reverse=True)
-            candidate_genome = genomes[0]
-
-            if best_genome is None or candidate_genome.fitness > best_genome.fitness:
-                best_genome = copy.deepcopy(candidate_genome)
-
-            reporter.best_genome(best_genome)
-
-            with open(f"generation_{self.generation}_winner.pkl", "wb") as f:
-                pickle.dump(best_genome, f)
-
-            if best_genome.fitness >= params.evaluation.fitness_threshold:
-                break
-
-            species = filter_stagnant_species(species, params.reproduction, reporter)
-            genomes = reproduce(species, params.reproduction)
-            species = speciate(genomes, species, params.speciation, self.innov_record)
-
-            reporter.end_generation(genomes, species)
-            reporter.data.save_to_file(f"generation_{self.generation}_stats.pkl")
-            self.generation += 1
-            iterations += 1
+        # The pickles of every generation are written by a background thread,
+        # so that evolution doesn't wait on the disk.
+        with BackgroundWriter() as writer:
+            iterations = 0
+            while not found_optimal_network:
+                if times is not None and iterations > times:
+                    break
+
+                reporter.start_generation(self.generation)
+
+                representatatives = get_representatives(species)
+                fitness_func(genomes, representatatives)
+                candidate_genome = max(genomes, key=attrgetter("fitness"))
+
+                if (
+                    best_genome is None
+                    or candidate_genome.fitness > best_genome.fitness
+                ):
+                    # A clone, as the candidate's fitness is overwritten next generation.
+                    best_genome = candidate_genome.clone()
+                    writer.save(best_genome, f"generation_{self.generation}_winner.pkl")
+
+                reporter.best_genome(best_genome)
+
+                if best_genome.fitness >= params.evaluation.fitness_threshold:
+                    break
+
+                species = filter_stagnant_species(
+                    species, params.reproduction, reporter
+                )
+                genomes = reproduce(species, params.reproduction, reporter)
+                species = speciate(
+                    genomes, species, params.speciation, self.innov_record
+                )
+
+                reporter.end_generation(genomes, species)
+                writer.save(reporter.data, f"generation_{self.generation}_stats.pkl")
+                self.generation += 1
+                iterations += 1
 
         reporter.data.save_to_file()
         if best_genome is None:
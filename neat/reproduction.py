@@ -1,12 +1,13 @@
-import copy
 import random
-from math import ceil
+from statistics import fmean
 
+import numpy as np
+
+from neat.genes import RNG
 from neat.genomes import Genome
 from neat.logging import Reporter
 from neat.parameters import ReproductionParams
 from neat.species import Species
-from neat.utils import mean
 
 
 def filter_stagnant_species(
@@ -32,26 +33,28 @@ def filter_stagnant_species(
     return remaining_species
 
 
-def reproduce(species_set: list[Species], params: ReproductionParams) -> list[Genome]:
-    all_fitnesses: list[float] = []
-    for species in species_set:
-        all_fitnesses.extend(g.fitness for g in species.genomes)
-
-    min_fitness = min(all_fitnesses)
-    max_fitness = max(all_fitnesses)
+def reproduce(
+    species_set: list[Species],
+    params: ReproductionParams,
+    reporter: Reporter,
+) -> list[Genome]:
+    # The fitnesses of every species are gathered once, in a single pass.
+    species_fitnesses = [
+        np.fromiter((g.fitness for g in s.genomes), np.float64, count=s.size)
+        for s in species_set
+    ]
+    all_fitnesses = np.concatenate(species_fitnesses)
+    min_fitness = all_fitnesses.min()
+    max_fitness = all_fitnesses.max()
     # Do not allow the fitness range to be zero, as we divide by it below.
     fitness_range = max(1.0, max_fitness - min_fitness)
 
-    adjusted_fitnesses: list[float] = []
-    for species in species_set:
-        # Compute adjusted fitness.
-        msf = mean([g.fitness for g in species.genomes])
-        adjusted_fitness = (msf - min_fitness) / fitness_range
-        adjusted_fitnesses.append(adjusted_fitness)
+    # Compute adjusted fitness.
+    mean_fitnesses = np.array([f.mean() for f in species_fitnesses])
+    adjusted_fitnesses = ((mean_fitnesses - min_fitness) / fitness_range).tolist()
+    for species, adjusted_fitness in zip(species_set, adjusted_fitnesses):
         species.fitness = adjusted_fitness
 
-    avg_adjusted_fitness = mean(adjusted_fitnesses)
-    print(f"Average adjusted fitness: {avg_adjusted_fitness:.3f}")
     offspring_per_species = compute_offspring_per_species(
         species_set,
         adjusted_fitnesses,
@@ -59,10 +62,13 @@ def reproduce(species_set: list[Species], params: ReproductionParams) -> list[Ge
     )
 
     for species in species_set:
-        species.sort_genomes_by_fitness()
         species.kill_worst(params.survival_rate, params.min_species_size)
 
+    # Inter species partners are drawn from all the surviving genomes, so
+    # larger species are picked proportionally more often.
+    all_genomes = [g for species in species_set for g in species.genomes]
     offspring: list[Genome] = []
+    children: list[Genome] = []
     times_parents_are_the_same = 0
     for species, offspring_num in zip(species_set, offspring_per_species):
         if species.size >= params.elitism_threshold:
@@ -73,15 +79,22 @@ def reproduce(species_set: list[Species], params: ReproductionParams) -> list[Ge
         if offspring_num <= 0:
             continue
 
-        for _ in range(offspring_num):
-            parent1 = random.choice(species.genomes)
-
-            if random.random() < params.crossover_rate:
-                if random.random() < params.inter_species_crossover_rate:
-                    species_of_parent2 = random.choice(species_set)
-                    parent2 = random.choice(species_of_parent2.genomes)
-                else:
-                    parent2 = random.choice(species.genomes)
+        # The parents and the crossover decisions of the species' offspring are
+        # drawn at once, instead of with several random calls per child.
+        parents1 = random.choices(species.genomes, k=offspring_num)
+        parents2 = random.choices(species.genomes, k=offspring_num)
+        crossovers = RNG.random(offspring_num) < params.crossover_rate
+        inter_species = RNG.random(offspring_num) < params.inter_species_crossover_rate
+        inter_species &= crossovers
+        inter_parents2 = iter(
+            random.choices(all_genomes, k=int(np.count_nonzero(inter_species)))
+        )
+        for parent1, parent2, crossover, inter in zip(
+            parents1, parents2, crossovers.tolist(), inter_species.tolist()
+        ):
+            if crossover:
+                if inter:
+                    parent2 = next(inter_parents2)
 
                 if parent1.id == parent2.id:
                     times_parents_are_the_same += 1
@@ -89,21 +102,16 @@ def reproduce(species_set: list[Species], params: ReproductionParams) -> list[Ge
                 # TODO might create cycles.
                 child = parent1.crossover(parent2)
             else:
-                id = parent1.innov_record.get_genome_id()
-                # We need to copy nodes and links because if the parent is an elite it
-                # will be transferred into the next generation and when we mutate him we
-                # will also mutate the child by mistake.
-                child = Genome(
-                    id,
-                    parent1.innov_record,
-                    copy.copy(parent1.nodes),
-                    copy.copy(parent1.links),
-                )
-
-            child.mutate()
+                # The child gets its own copy of the genes, because if the parent
+                # is an elite it will be transferred into the next generation and
+                # mutating the child would also mutate him by mistake.
+                child = parent1.clone(parent1.innov_record.get_genome_id())
+
+            children.append(child)
             offspring.append(child)
 
-    print(f"Times parents were the same {times_parents_are_the_same}")
+    Genome.mutate_population(children)
+    reporter.reproduction(fmean(adjusted_fitnesses), times_parents_are_the_same)
     return offspring
 
 
@@ -112,24 +120,20 @@ def compute_offspring_per_species(
     adjusted_fitnesses: list[float],
     params: ReproductionParams,
 ) -> list[int]:
-    population = params.population
     min_species_size = params.min_species_size
-    adj_fitness_sum = sum(adjusted_fitnesses)
-    # Contains the number of genomes that each species must generate
-    # to fill out the population.
-    offspring_per_species: list[int] = []
+    fitnesses = np.asarray(adjusted_fitnesses, dtype=np.float64)
+    adj_fitness_sum = fitnesses.sum()
     if adj_fitness_sum != 0:
-        for fitness in adjusted_fitnesses:
-            normalized_fitness = fitness / adj_fitness_sum
-            genomes_spawn_count = ceil(population * normalized_fitness)
-            genomes_spawn_count = max(min_species_size, genomes_spawn_count)
-            offspring_per_species.append(genomes_spawn_count)
+        probabilities = fitnesses / adj_fitness_sum
     else:
         # All members of all species have zero fitness.
-        # Allocate each species an equal number of offspring.
-        genomes_spawn_count = ceil(population / len(species_set))
-        offspring_per_species = [genomes_spawn_count for _ in species_set]
-
-    # Ensure that the species sizes sum is close to the population size.
-    norm = population / sum(offspring_per_species)
-    return [max(min_species_size, int(round(n * norm))) for n in offspring_per_species]
+        # Allocate each species an equal share of the offspring.
+        probabilities = np.full(len(species_set), 1 / len(species_set))
+
+    # Every species gets its minimum size first and the rest of the population
+    # is distributed with a single multinomial draw. So the offspring sum up
+    # exactly to the population without rounding up any species, unless the
+    # minimum sizes alone exceed it.
+    remaining = max(0, params.population - min_species_size * len(species_set))
+    offspring_per_species = RNG.multinomial(remaining, probabilities)
+    return (offspring_per_species + min_species_size).tolist()
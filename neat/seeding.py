@@ -0,0 +1,23 @@
+import os
+import random
+from typing import Optional
+
+import numpy as np
+
+from neat.genes import RNG, Link, Node
+
+
+def seed(value: Optional[int] = None):
+    """Seeds every random source of NEAT, both `random` and `RNG`, so that runs
+    with the same seed produce the same genomes. `None` seeds from the OS."""
+    random.seed(value)
+    # In place, since other modules hold references to the generator.
+    RNG.bit_generator.state = np.random.PCG64(value).state
+    # The pooled initial values were drawn with the previous state.
+    Node.clear_initial_values()
+    Link.clear_initial_values()
+
+
+# Forked worker processes would otherwise inherit the state of the parent's
+# generators and pools, and draw the exact same values.
+os.register_at_fork(after_in_child=seed)
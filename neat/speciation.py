@@ -1,4 +1,10 @@
-from neat.genomes.genome import Genome
+import math
+from typing import Optional
+
+import numpy as np
+from numba import njit
+
+from neat.genomes.genome import GeneArrays, Genome
 from neat.innovation import InnovationRecord
 from neat.parameters import SpeciationParams
 from neat.species import Species, SpeciesInfo
@@ -17,25 +23,33 @@ def speciate(
         params,
     )
 
-    new_species_set: dict[int, Species] = {}
     for info in new_species_info:
         info.add_age()
-        species = Species(info, params)
-        new_species_set[species.id] = species
 
+    new_species_set = {info.id: Species(info, params) for info in new_species_info}
+    # The species with the gene arrays of their representative, taken once
+    # per species instead of once per compared genome.
+    candidates = [(s, s.representative.gene_arrays()) for s in new_species_set.values()]
+    compatibility_threshold = params.compatibility_threshold
+    coefficient = params.compatibility_disjoint_coefficient
     for genome in unspeciated:
-        candidates: list[tuple[int, float]] = []
-        for species in new_species_set.values():
-            distance = get_genomes_distance(species.representative, genome, params)
-            if distance < params.compatibility_threshold:
-                candidates.append((species.id, distance))
-
-        if candidates:
-            species_id = min(candidates, key=lambda x: x[1])[0]
-            new_species_set[species_id].assign_genome(genome)
+        arrays = genome.gene_arrays()
+        # The closest species within the compatibility threshold, if any.
+        best_species: Optional[Species] = None
+        best_distance = compatibility_threshold
+        for species, representative_arrays in candidates:
+            distance = get_gene_arrays_distance(
+                representative_arrays, arrays, coefficient, best_distance
+            )
+            if distance < best_distance:
+                best_species, best_distance = species, distance
+
+        if best_species is not None:
+            best_species.assign_genome(genome)
         else:
             new_species = get_new_species(genome, innov_record, params)
             new_species_set[new_species.id] = new_species
+            candidates.append((new_species, arrays))
 
     return list(new_species_set.values())
 
@@ -45,18 +59,40 @@ def select_new_representatives(
     species_info: list[SpeciesInfo],
     params: SpeciationParams,
 ) -> tuple[list[Genome], list[SpeciesInfo]]:
+    """Picks the closest unspeciated genome as the new representative of every
+    species. Species that are left without a genome to pick are dropped,
+    instead of keeping a representative from the previous generation."""
+    # A copy, so that the caller's list is left untouched, from which the
+    # picked representatives are removed by swapping them with the last genome.
+    unspeciated = list(unspeciated)
+    unspeciated_arrays = [genome.gene_arrays() for genome in unspeciated]
+    coefficient = params.compatibility_disjoint_coefficient
+    remaining_info: list[SpeciesInfo] = []
     for info in species_info:
-        representative = info.representative
-        candidates: list[tuple[Genome, float]] = []
-        for genome in unspeciated:
-            distance = get_genomes_distance(representative, genome, params)
-            candidates.append((genome, distance))
-
-        best_candidate = min(candidates, key=lambda x: x[1])[0]
-        info.representative = best_candidate
-        unspeciated.remove(best_candidate)
-
-    return unspeciated, species_info
+        if not unspeciated:
+            break
+
+        representative_arrays = info.representative.gene_arrays()
+        best_index = -1
+        best_distance = math.inf
+        for index, arrays in enumerate(unspeciated_arrays):
+            distance = get_gene_arrays_distance(
+                representative_arrays, arrays, coefficient, best_distance
+            )
+            if distance < best_distance:
+                best_index, best_distance = index, distance
+                # Distances are never negative, there can't be a closer genome.
+                if distance == 0.0:
+                    break
+
+        info.representative = unspeciated[best_index]
+        remaining_info.append(info)
+        unspeciated[best_index] = unspeciated[-1]
+        unspeciated.pop()
+        unspeciated_arrays[best_index] = unspeciated_arrays[-1]
+        unspeciated_arrays.pop()
+
+    return unspeciated, remaining_info
 
 
 def get_representatives(species_set: list[Species]) -> list[Genome]:
@@ -76,41 +112,103 @@ def get_genomes_distance(
     genome1: Genome,
     genome2: Genome,
     params: SpeciationParams,
+    bound: float = math.inf,
 ) -> float:
-    node_distance: float = 0.0
-    disjoint_nodes: int = 0
-    num_of_common_node_genes: int = 0
-
-    if genome1.nodes or genome2.nodes:
-        for node_id, node in genome1.nodes.items():
-            if node2 := genome2.nodes.get(node_id):
-                num_of_common_node_genes += 1
-                node_distance += node.distance(node2)
-            else:
-                disjoint_nodes += 1
-
-        disjoint_nodes += len(genome2.nodes) - num_of_common_node_genes
-        max_nodes = max(len(genome1.nodes), len(genome2.nodes))
-        node_distance = (
-            node_distance + params.compatibility_disjoint_coefficient * disjoint_nodes
-        ) / max_nodes
-
-    link_distance = 0.0
-    disjoint_links = 0
-    num_of_common_link_genes = 0
-
-    if genome1.links or genome2.links:
-        for link_id, link in genome1.links.items():
-            if link2 := genome2.links.get(link_id):
-                num_of_common_link_genes += 1
-                link_distance += link.distance(link2)
-            else:
-                disjoint_links += 1
-
-        disjoint_links += len(genome2.links) - num_of_common_link_genes
-        max_links = max(len(genome1.links), len(genome2.links))
-        link_distance = (
-            link_distance + params.compatibility_disjoint_coefficient * disjoint_links
-        ) / max_links
+    """Returns the distance between the genomes. The computation stops as soon
+    as the distance is known to be at least `bound`, in which case a value that
+    is at least `bound`, but not the exact distance, is returned."""
+    return get_gene_arrays_distance(
+        genome1.gene_arrays(),
+        genome2.gene_arrays(),
+        params.compatibility_disjoint_coefficient,
+        bound,
+    )
 
+
+def get_gene_arrays_distance(
+    arrays1: GeneArrays,
+    arrays2: GeneArrays,
+    coefficient: float,
+    bound: float = math.inf,
+) -> float:
+    # At least the difference in the number of genes is disjoint, which bounds
+    # each part of the distance from below without merging the genes.
+    node_lower_bound = coefficient * get_size_ratio(
+        arrays1.node_ids.size, arrays2.node_ids.size
+    )
+    link_lower_bound = coefficient * get_size_ratio(
+        arrays1.link_ids.size, arrays2.link_ids.size
+    )
+    if node_lower_bound + link_lower_bound >= bound:
+        return node_lower_bound + link_lower_bound
+
+    node_distance = get_genes_distance(
+        arrays1.node_ids,
+        arrays1.node_values,
+        arrays1.node_categories,
+        arrays2.node_ids,
+        arrays2.node_values,
+        arrays2.node_categories,
+        coefficient,
+    )
+    if node_distance + link_lower_bound >= bound:
+        return node_distance + link_lower_bound
+
+    link_distance = get_genes_distance(
+        arrays1.link_ids,
+        arrays1.link_values,
+        arrays1.link_categories,
+        arrays2.link_ids,
+        arrays2.link_values,
+        arrays2.link_categories,
+        coefficient,
+    )
     return node_distance + link_distance
+
+
+def get_size_ratio(size1: int, size2: int) -> float:
+    max_size = max(size1, size2)
+    return abs(size1 - size2) / max_size if max_size else 0.0
+
+
+@njit(cache=True, fastmath=True)
+def get_genes_distance(
+    ids1: np.ndarray,
+    values1: np.ndarray,
+    categories1: np.ndarray,
+    ids2: np.ndarray,
+    values2: np.ndarray,
+    categories2: np.ndarray,
+    disjoint_coefficient: float,
+) -> float:
+    """Returns the distance of two sets of genes, given as the arrays of
+    `GeneArrays`. The distance of the common genes and the number of disjoint
+    ones are normalized by the size of the largest set."""
+    size1, size2 = ids1.size, ids2.size
+    max_genes = max(size1, size2)
+    if max_genes == 0:
+        return 0.0
+
+    # A single merge over the sorted ids finds the common genes.
+    distance = 0.0
+    common = 0
+    i = j = 0
+    while i < size1 and j < size2:
+        if ids1[i] < ids2[j]:
+            i += 1
+        elif ids1[i] > ids2[j]:
+            j += 1
+        else:
+            for k in range(values1.shape[1]):
+                distance += abs(values1[i, k] - values2[j, k])
+
+            for k in range(categories1.shape[1]):
+                if categories1[i, k] != categories2[j, k]:
+                    distance += 1.0
+
+            common += 1
+            i += 1
+            j += 1
+
+    disjoint = size1 + size2 - 2 * common
+    return (distance + disjoint_coefficient * disjoint) / max_genes
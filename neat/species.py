@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import heapq
+from collections import deque
 from dataclasses import dataclass, field
 from math import ceil
+from operator import attrgetter
 
 from neat.genomes.genome import Genome
 from neat.parameters import SpeciationParams
@@ -12,7 +15,7 @@ class SpeciesInfo:
     id: int
     representative: Genome
     age: int = 0
-    fitness_history: list[float] = field(default_factory=lambda: [0])
+    fitness_history: deque[float] = field(default_factory=lambda: deque([0]))
     stagnant: int = 0
 
     def add_age(self):
@@ -23,6 +26,12 @@ class Species:
     def __init__(self, info: SpeciesInfo, params: SpeciationParams):
         self.info = info
         self.max_fitness_history_size = params.max_stagnation
+        # The history is bounded, so that appending to it drops the oldest entry.
+        if info.fitness_history.maxlen != params.max_stagnation:
+            info.fitness_history = deque(
+                info.fitness_history, maxlen=params.max_stagnation
+            )
+
         self.genomes = [info.representative]
 
     def __le__(self, other: Species) -> bool:
@@ -51,15 +60,11 @@ class Species:
     @fitness.setter
     def fitness(self, value: float):
         self.info.fitness_history.append(value)
-
-        if len(self.info.fitness_history) > self.max_fitness_history_size:
-            self.info.fitness_history.pop(0)
-
         if self.info.fitness_history[-1] - self.info.fitness_history[-2] < 0:
             self.info.stagnant += 1
 
     @property
-    def fitness_history(self) -> list[float]:
+    def fitness_history(self) -> deque[float]:
         return self.info.fitness_history
 
     @property
@@ -74,11 +79,12 @@ class Species:
         self.genomes.append(genome)
 
     def kill_worst(self, survival_rate: float, min_size: int):
+        """Keeps only the fittest genomes, sorted by fitness."""
         remaining = max(ceil(self.size * survival_rate), min_size)
-        self.genomes = self.genomes[:remaining]
-
-    def sort_genomes_by_fitness(self):
-        self.genomes.sort(key=lambda g: g.fitness, reverse=True)
+        # Only the survivors need to be ordered, not the whole species.
+        self.genomes = heapq.nlargest(
+            remaining, self.genomes, key=attrgetter("fitness")
+        )
 
     def elites(self, count: int) -> list[Genome]:
         return self.genomes[:count]
@@ -1,34 +1,34 @@
 import random
+from itertools import islice
+from statistics import fmean
 from typing import Any, Literal
 
-from numba import njit
 
-
-@njit
 def clamp(value: float, lower: float, upper: float) -> float:
-    return min(max(value, lower), upper)
+    if value < lower:
+        return lower
+
+    return upper if value > upper else value
 
 
-@njit
 def randon_sign() -> Literal[-1, 1]:
     return 1 if random.random() > 0.5 else -1
 
 
-@njit
 def mean(values: list[float]) -> float:
-    values = list(values)
-    return sum(values) / len(values)
+    return fmean(values)
 
 
-@njit
 def variance(values: list[float]) -> float:
-    return sum([(v - mean(values)) ** 2 for v in values]) / len(values)
+    # The mean is computed once, instead of once per value.
+    values_mean = fmean(values)
+    return sum((value - values_mean) ** 2 for value in values) / len(values)
 
 
-@njit
 def stdev(values: list[float]) -> float:
-    return variance(values) ** 2
+    return variance(values) ** 0.5
 
 
 def get_random_value(d: dict[Any, Any]) -> Any:
-    return random.choice(list(d.values()))
+    # Skips to a random position, instead of copying all the values to a list.
+    return next(islice(d.values(), random.randrange(len(d)), None))
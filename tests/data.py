@@ -3,6 +3,7 @@ from pathlib import Path
 DATAFILES = Path(__file__).parent / "datafiles"
 
 CONFIG_FILEPATH = DATAFILES / "example_config.ini"
+XOR_CONFIG_FILEPATH = Path(__file__).parents[1] / "examples" / "xor.ini"
 
 correct_config_representation = """[Parameters]
 
@@ -0,0 +1,22 @@
+import multiprocessing
+import time
+
+from neat.evaluators import ParallelEvaluator
+from tests.test_networks import create_genome
+
+
+def count_links(genome, opponents) -> float:
+    return len(genome.links) + len(opponents)
+
+
+def test_parallel_evaluator_close():
+    genomes = [create_genome() for _ in range(8)]
+    evaluator = ParallelEvaluator(2, count_links)
+    evaluator.evaluate(genomes, genomes[:3])
+    assert [genome.fitness for genome in genomes] == [8.0] * 8
+
+    workers = multiprocessing.active_children()
+    start = time.perf_counter()
+    evaluator.close()
+    assert time.perf_counter() - start < 0.5
+    assert workers and all(worker.exitcode == 0 for worker in workers)
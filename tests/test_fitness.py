@@ -0,0 +1,11 @@
+import numpy as np
+
+from neat.fitness import least_squares
+
+
+def test_least_squares():
+    output = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+    correct_output = np.array([0.0, 2.0, 5.0], dtype=np.float32)
+
+    assert least_squares(output, correct_output) == 5.0
+    assert least_squares(output.astype(np.float64), output.astype(np.float64)) == 0.0
@@ -0,0 +1,62 @@
+import neat
+from neat.genomes.genome import Genome, creates_cycle
+from neat.innovation import InnovationRecord
+from neat.logging import Reporter
+from neat.parameters import Parameters
+from neat.reproduction import reproduce
+from neat.speciation import speciate
+from tests.data import XOR_CONFIG_FILEPATH
+from tests.test_networks import create_genome
+
+
+def test_creates_cycle():
+    # 0 -> 2 -> 3 -> 1 and 0 -> 1
+    adjacency = {0: [2, 1], 2: [3], 3: [1]}
+
+    assert creates_cycle(adjacency, (1, 0))
+    assert creates_cycle(adjacency, (1, 2))
+    assert creates_cycle(adjacency, (3, 3))
+    assert not creates_cycle(adjacency, (2, 1))
+    assert not creates_cycle(adjacency, (0, 3))
+    assert not creates_cycle(adjacency, (4, 0))
+
+
+def test_clone():
+    genome = create_genome()
+    genome.fitness = 3.0
+
+    clone = genome.clone()
+    assert (clone.id, clone.fitness) == (genome.id, genome.fitness)
+    assert clone.innov_record is genome.innov_record
+    assert clone.links.keys() == genome.links.keys()
+    assert all(clone.links[i] is not l for i, l in genome.links.items())
+
+    child = genome.clone(7)
+    assert (child.id, child.fitness) == (7, 0.0)
+
+
+def evolve(seed: int) -> list[str]:
+    neat.seed(seed)
+    params = Parameters(XOR_CONFIG_FILEPATH)
+    Genome.initialize_configuration(params.genome)
+    innov_record = InnovationRecord(params.genome.inputs, params.genome.outputs)
+    genomes = [
+        Genome(innov_record.get_genome_id(), innov_record)
+        for _ in range(params.reproduction.population)
+    ]
+    reporter = Reporter()
+    reporter.show_generations = False
+    species = []
+    for _ in range(3):
+        for genome in genomes:
+            genome.fitness = sum(link.weight for link in genome.links.values())
+
+        species = speciate(genomes, species, params.speciation, innov_record)
+        genomes = reproduce(species, params.reproduction, reporter)
+
+    return [repr(genome) for genome in genomes]
+
+
+def test_seeded_runs_are_reproducible():
+    assert evolve(3) == evolve(3)
+    assert evolve(3) != evolve(4)
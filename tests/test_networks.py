@@ -0,0 +1,79 @@
+import math
+import pickle
+
+import numpy as np
+
+from neat.activations import ActivationFuncs
+from neat.aggregations import AggregationFuncs
+from neat.genes import Link, Node, NodeType
+from neat.genomes.genome import Genome
+from neat.innovation import InnovationRecord
+from neat.networks import FeedForwardNetwork
+from neat.networks.utils import get_feed_forward_layers, required_for_output
+
+
+def create_genome() -> Genome:
+    """Inputs 0 and 1, output 2 and a sigmoid hidden node 3."""
+    sigmoid, linear = ActivationFuncs.SIGMOID, ActivationFuncs.LINEAR
+    nodes = {
+        0: Node(0, NodeType.INPUT, 0.0, 1.0, AggregationFuncs.SUM, linear),
+        1: Node(1, NodeType.INPUT, 0.0, 1.0, AggregationFuncs.SUM, linear),
+        2: Node(2, NodeType.OUTPUT, 0.0, 1.0, AggregationFuncs.SUM, linear),
+        3: Node(3, NodeType.HIDDEN, 0.5, 1.0, AggregationFuncs.SUM, sigmoid),
+    }
+    links = {
+        0: Link(0, 0, 3, 1.0, True, False),
+        1: Link(1, 1, 3, -1.0, True, False),
+        2: Link(2, 3, 2, 2.0, True, False),
+        3: Link(3, 0, 2, 0.5, True, False),
+        4: Link(4, 1, 2, 9.0, False, False),
+    }
+    return Genome(0, InnovationRecord(2, 1), nodes, links)
+
+
+def expected_output(x0: float, x1: float) -> float:
+    hidden = 1.0 / (1.0 + math.exp(-5.0 * (x0 - x1 + 0.5)))
+    return 2.0 * hidden + 0.5 * x0
+
+
+def test_feed_forward_activate():
+    network = FeedForwardNetwork.from_genome(create_genome())
+    inputs = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+
+    for x0, x1 in inputs:
+        assert np.isclose(
+            network.activate(np.array([x0, x1]))[0], expected_output(x0, x1)
+        )
+
+    outputs = network.activate_batch(inputs)
+    assert outputs.shape == (4, 1)
+    assert np.allclose(outputs[:, 0], [expected_output(*row) for row in inputs])
+
+
+def test_from_genome_cached():
+    genome = create_genome()
+    network = FeedForwardNetwork.from_genome_cached(genome)
+    assert FeedForwardNetwork.from_genome_cached(genome) is network
+
+    # The cached networks are not sent along with the genome.
+    assert pickle.loads(pickle.dumps(genome)).networks == {}
+
+
+def test_get_feed_forward_layers():
+    # Node 5 is never used and node 6 is part of a cycle.
+    links = [(0, 3), (1, 3), (3, 4), (4, 2), (0, 2), (3, 5), (6, 2), (2, 6)]
+
+    assert required_for_output([0, 1], [2], links) == {2, 3, 4, 6}
+    assert get_feed_forward_layers([0, 1], [2], links) == [{3}, {4}]
+
+
+def test_fused_layers_match_numpy_layers():
+    network = FeedForwardNetwork.from_genome(create_genome())
+    inputs = np.random.default_rng(0).random((16, 2), dtype=np.float32)
+    assert all(layer.activation_codes is not None for layer in network.layers)
+    fused = network.activate_batch(inputs)
+
+    for layer in network.layers:
+        layer.activation_codes = None
+
+    assert np.allclose(fused, network.activate_batch(inputs), atol=1e-6)
@@ -1,7 +1,61 @@
-from neat.parameters import Parameters
-from tests.data import CONFIG_FILEPATH, correct_config_representation
+import os
+
+from neat.config_parser import parse_config
+from neat.genes import Link
+from neat.parameters import _PARAMETERS_CACHE, Parameters, _to_snake
+from tests.data import (
+    CONFIG_FILEPATH,
+    XOR_CONFIG_FILEPATH,
+    correct_config_representation,
+)
 
 
 def test_read_parameters():
     params = Parameters(CONFIG_FILEPATH)
     assert str(params) == correct_config_representation
+
+
+def test_parse_config(tmp_path):
+    config_file = tmp_path / "config.ini"
+    config_file.write_text(
+        "# comment\n[NEAT]\npopulation = 150\n\n[Genome]\n; comment\n"
+        "Bias Init Mean: 0.5\nactivator_options = sigmoid,relu\n"
+    )
+
+    assert parse_config(config_file, normalize=_to_snake) == {
+        "neat": {"population": "150"},
+        "genome": {"bias_init_mean": "0.5", "activator_options": "sigmoid,relu"},
+    }
+
+
+def test_parameters_cache(tmp_path, monkeypatch):
+    config_file = tmp_path / "xor.ini"
+    config = XOR_CONFIG_FILEPATH.read_text()
+    config_file.write_text(config)
+    monkeypatch.chdir(tmp_path)
+
+    Parameters("xor.ini")
+    Parameters(config_file)
+    assert list(_PARAMETERS_CACHE).count(config_file.resolve()) == 1
+
+    config_file.write_text(config.replace("= 150", "= 20"))
+    os.utime(config_file, ns=(0, 0))
+    params = Parameters("xor.ini")
+    assert params.reproduction.population == 20
+    assert list(_PARAMETERS_CACHE).count(config_file.resolve()) == 1
+
+
+def test_parameters_changed_in_place():
+    params = Parameters(XOR_CONFIG_FILEPATH).genome
+    links = [Link(0, 0, 2, 1.0, True, False)]
+    Link.mutate_batch(links, params)
+    assert params.attribute_params("weight").mutation_chance < 1.0
+
+    params.weight_mutation_chance = 1.0
+    params.weight_replace_chance = 0.0
+    params.weight_mutation_power = 0.0
+    assert params.attribute_params("weight").mutation_chance == 1.0
+
+    links[0].weight = 1.0
+    Link.mutate_batch(links, params)
+    assert links[0].weight == 1.0
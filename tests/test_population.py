@@ -0,0 +1,19 @@
+import pytest
+
+from neat.population import BackgroundWriter
+
+
+def test_background_writer(tmp_path):
+    with BackgroundWriter() as writer:
+        writer.save([1, 2], str(tmp_path / "saved.pkl"))
+    assert (tmp_path / "saved.pkl").exists()
+
+    with pytest.raises(OSError):
+        with BackgroundWriter() as writer:
+            writer.save([1, 2], str(tmp_path / "missing" / "saved.pkl"))
+
+    # A failed write doesn't replace the error that is leaving the block.
+    with pytest.raises(KeyError):
+        with BackgroundWriter() as writer:
+            writer.save([1, 2], str(tmp_path / "missing" / "saved.pkl"))
+            raise KeyError("run failed")
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from neat.genes import Link
+from neat.innovation import InnovationRecord
+from neat.speciation import get_genomes_distance, speciate
+from neat.species import Species, SpeciesInfo
+from tests.test_networks import create_genome
+
+
+def test_genomes_distance():
+    params = SimpleNamespace(compatibility_disjoint_coefficient=1.5)
+    genome1 = create_genome()
+    genome2 = create_genome()
+    genome2.nodes[3].bias = -1.0
+    genome2.remove_link(4)
+    genome2.add_link(Link(5, 0, 2, 1.0, True, True))
+
+    distance = get_genomes_distance(genome1, genome2, params)
+    # 1.5 / 4 for the bias, and 2 * 1.5 / 5 for the disjoint links.
+    assert abs(distance - (1.5 / 4 + 3.0 / 5)) < 1e-12
+
+
+def test_genomes_distance_bound():
+    params = SimpleNamespace(compatibility_disjoint_coefficient=1.5)
+    genome1 = create_genome()
+    genome2 = create_genome()
+    genome2.remove_link(4)
+    genome2.remove_link(3)
+
+    distance = get_genomes_distance(genome1, genome2, params)
+    assert get_genomes_distance(genome1, genome2, params, distance + 0.1) == distance
+    assert get_genomes_distance(genome1, genome2, params, 0.1) >= 0.1
+
+
+def test_speciate_drops_species_without_genomes():
+    params = SimpleNamespace(
+        compatibility_threshold=10.0,
+        compatibility_disjoint_coefficient=1.5,
+        max_stagnation=5,
+    )
+    old_species = [Species(SpeciesInfo(i, create_genome()), params) for i in (0, 1)]
+    genome = create_genome()
+
+    species_set = speciate([genome], old_species, params, InnovationRecord(2, 1))
+    assert [species.id for species in species_set] == [0]
+    assert species_set[0].genomes == [genome]